@@ -5,14 +5,17 @@ Analyzes CSV history files and generates convergence plots.
 """
 
 import json
-import csv
 from pathlib import Path
+from typing import Tuple
 import numpy as np
 
 # Import from existing scripts
 import sys
-sys.path.append(str(Path(__file__).parent.parent))
+_DEV_DIR = str(Path(__file__).parent.parent)
+if _DEV_DIR not in sys.path:  # Already there when run as a dev/ script
+    sys.path.append(_DEV_DIR)
 from export_to_unity import PARAMETER_BOUNDS, PARAMETER_NAMES
+from core.history_tracker import load_history_columns
 
 
 def load_baseline_objective(baseline_path: str = "data/output/baseline_objective.json") -> float:
@@ -45,6 +48,26 @@ def load_baseline_objective(baseline_path: str = "data/output/baseline_objective
         return 4.5932
 
 
+def best_per_generation(generations: np.ndarray, objectives: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Find the best evaluation of each generation.
+
+    Args:
+        generations: Generation number per evaluation
+        objectives: Objective value per evaluation
+
+    Returns:
+        (sorted unique generations, row index of best evaluation per generation, evaluations per generation)
+    """
+    unique_generations, group, counts = np.unique(generations, return_inverse=True, return_counts=True)
+
+    # Sort by (generation, objective); stable so ties keep the earliest evaluation
+    order = np.lexsort((objectives, group))
+    starts = np.searchsorted(group[order], np.arange(len(unique_generations)))
+
+    return unique_generations, order[starts], counts
+
+
 def analyze_optimization_history(history_path: str):
     """
     Analyze optimization history from CSV.
@@ -65,56 +88,49 @@ def analyze_optimization_history(history_path: str):
         return
 
     # Read CSV
-    with open(history_path, 'r') as f:
-        reader = csv.DictReader(f)
-        rows = list(reader)
+    columns, data = load_history_columns(history_path)
 
-    if len(rows) == 0:
+    if len(data) == 0:
         print("ERROR: History file is empty")
         return
 
-    # Convert to numeric
-    iterations = [int(row['iteration']) for row in rows]
-    objectives = [float(row['objective']) for row in rows]
-    generations = [int(row['generation']) for row in rows]
+    iterations = data[:, columns['iteration']].astype(np.int64)
+    objectives = np.ascontiguousarray(data[:, columns['objective']])  # Contiguous copy for the reductions below
+    generations = data[:, columns['generation']].astype(np.int64)
+
+    # Reductions over objectives (std reuses the mean instead of recomputing it)
+    best_idx = int(objectives.argmin())
+    best_obj = float(objectives[best_idx])
+    worst_obj = float(objectives.max())
+    mean_obj = float(objectives.mean())
+    std_obj = float(np.sqrt(np.mean(np.square(objectives - mean_obj))))
 
     # Summary statistics
     print("=" * 80)
     print("OPTIMIZATION HISTORY ANALYSIS")
     print("=" * 80)
     print(f"History file:      {history_path}")
-    print(f"Total evaluations: {len(rows)}")
-    print(f"Best objective:    {min(objectives):.4f} (iteration {iterations[objectives.index(min(objectives))]})")
-    print(f"Worst objective:   {max(objectives):.4f}")
-    print(f"Mean objective:    {sum(objectives) / len(objectives):.4f}")
-    print(f"Std objective:     {np.std(objectives):.4f}")
+    print(f"Total evaluations: {len(data)}")
+    print(f"Best objective:    {best_obj:.4f} (iteration {iterations[best_idx]})")
+    print(f"Worst objective:   {worst_obj:.4f}")
+    print(f"Mean objective:    {mean_obj:.4f}")
+    print(f"Std objective:     {std_obj:.4f}")
     print()
 
     # Group by generation (use CSV generation column)
-    unique_generations = sorted(set(generations))
+    unique_generations, gen_best_idx, gen_counts = best_per_generation(generations, objectives)
 
     if len(unique_generations) > 1:
         print("Best objective per generation:")
         print("-" * 80)
 
-        for gen in unique_generations:
-            gen_objs = [objectives[i] for i, g in enumerate(generations) if g == gen]
-            gen_iters = [iterations[i] for i, g in enumerate(generations) if g == gen]
-
-            if gen_objs:
-                best_gen_obj = min(gen_objs)
-                best_gen_iter = gen_iters[gen_objs.index(best_gen_obj)]
-                print(f"  Generation {gen:2d} ({len(gen_objs):3d} evals): {best_gen_obj:.4f} (iter {best_gen_iter})")
+        for gen, i, count in zip(unique_generations, gen_best_idx, gen_counts):
+            print(f"  Generation {gen:2d} ({count:3d} evals): {objectives[i]:.4f} (iter {iterations[i]})")
 
         print()
 
-    # Best parameters
-    best_idx = objectives.index(min(objectives))
-    best_row = rows[best_idx]
-
     # Load and compare with baseline
     baseline_obj = load_baseline_objective()
-    best_obj = min(objectives)
     improvement = baseline_obj - best_obj
     improvement_pct = (improvement / baseline_obj * 100) if baseline_obj > 0 else 0
 
@@ -128,7 +144,7 @@ def analyze_optimization_history(history_path: str):
     print("BEST PARAMETERS:")
     print("-" * 80)
     for param_name in PARAMETER_NAMES:
-        value = float(best_row[param_name])
+        value = data[best_idx, columns[param_name]]
         bounds_str = f"[{PARAMETER_BOUNDS[param_name][0]}, {PARAMETER_BOUNDS[param_name][1]}]"
         print(f"{param_name:30s} {value:10.4f}  {bounds_str}")
     print()
@@ -153,14 +169,8 @@ def analyze_optimization_history(history_path: str):
         # Plot best per generation (use CSV generation column)
         if len(unique_generations) > 1:
             plt.subplot(1, 2, 2)
-            gen_bests = []
-            gen_nums = []
-
-            for gen in unique_generations:
-                gen_objs = [objectives[i] for i, g in enumerate(generations) if g == gen]
-                if gen_objs:
-                    gen_bests.append(min(gen_objs))
-                    gen_nums.append(gen)
+            gen_bests = objectives[gen_best_idx]
+            gen_nums = unique_generations
 
             plt.plot(gen_nums, gen_bests, 'o-', linewidth=2, markersize=8, label='Best per gen')
             plt.axhline(y=baseline_obj, color='r', linestyle='--', linewidth=1.5, label='Baseline', alpha=0.7)
@@ -189,3 +199,25 @@ def analyze_optimization_history(history_path: str):
         print("Note: Install matplotlib to generate convergence plots")
         print("  pip install matplotlib")
         print()
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Analyze an optimization history CSV and save its convergence plot",
+        epilog="Example:\n  python dev/analysis/analyze_history.py data/output/history_ScipyDE_best1bin_20250116_143052.csv",
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument('history_csv', type=str, help='History CSV written by run_optimization.py')
+    args = parser.parse_args()
+
+    if not Path(args.history_csv).exists():
+        print(f"ERROR: History file not found: {args.history_csv}")
+        return 1
+    analyze_optimization_history(args.history_csv)
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -5,6 +5,7 @@ This package contains:
 - unity_simulator: Unity Editor automation and execution
 - objective_function: Objective evaluation wrapper
 - parameter_utils: Parameter conversion and validation utilities
+- checkpoint: Checkpoint save/load for resumable runs
 """
 
-__all__ = ['unity_simulator', 'objective_function', 'parameter_utils']
+__all__ = ['unity_simulator', 'objective_function', 'parameter_utils', 'checkpoint']
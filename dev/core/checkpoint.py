@@ -0,0 +1,151 @@
+"""
+Checkpoint persistence for resumable optimization runs.
+
+A checkpoint is stored as two files in the output directory:
+- checkpoint_state.json: metadata (eval counter, generation, best solution, ...)
+- checkpoint_rng.npz: np.random global state arrays
+
+Both are written to a temporary file first and moved into place with
+os.replace, so an interrupted save (Ctrl-C, Unity crash) never leaves a
+truncated checkpoint. The JSON is written last and acts as the commit point;
+both files are fsynced before the rename and the previous state is kept as
+checkpoint_state.prev.json, which load_checkpoint() falls back to if the
+current file is missing or unreadable (e.g. after a power loss).
+The RNG file is only rewritten when the state differs from the last save
+(the optimizers draw from their own generators, so it rarely changes).
+
+No pickle is involved: the state is plain JSON and the RNG arrays are loaded
+with allow_pickle=False. Checkpoints from older versions (checkpoint_latest.pkl)
+are still loaded as a fallback; the next save replaces them with the new format.
+"""
+
+import os
+import json
+from pathlib import Path
+from typing import Any, Dict
+import numpy as np
+
+DEFAULT_CHECKPOINT_DIR = "data/output"
+STATE_FILENAME = "checkpoint_state.json"
+PREV_STATE_FILENAME = "checkpoint_state.prev.json"
+RNG_FILENAME = "checkpoint_rng.npz"
+LEGACY_FILENAME = "checkpoint_latest.pkl"
+
+# Last RNG state written per checkpoint directory (skips identical rewrites)
+_last_random_state = {}
+
+
+def save_checkpoint(checkpoint: Dict[str, Any], output_dir: str = DEFAULT_CHECKPOINT_DIR) -> Path:
+    """
+    Save checkpoint atomically.
+
+    Args:
+        checkpoint: Checkpoint dict. 'best_params' may be an array, 'random_state'
+                    a np.random.get_state() tuple (optional; without it no RNG file is kept);
+                    all other values must be JSON-serializable
+        output_dir: Directory for the checkpoint files
+
+    Returns:
+        Path to the checkpoint state JSON
+    """
+    directory = Path(output_dir)
+    directory.mkdir(parents=True, exist_ok=True)
+
+    state = dict(checkpoint)
+    random_state = state.pop('random_state', None)
+    if state.get('best_params') is not None:
+        state['best_params'] = np.asarray(state['best_params'], dtype=np.float64).tolist()
+    if state.get('best_objective') is not None:
+        state['best_objective'] = float(state['best_objective'])
+
+    if random_state is not None:
+        name, keys, pos, has_gauss, cached_gaussian = random_state
+        rng_path = directory / RNG_FILENAME
+        last = _last_random_state.get(rng_path)
+        unchanged = (
+            last is not None and rng_path.exists()
+            and last[0] == (name, pos, has_gauss, cached_gaussian) and np.array_equal(last[1], keys)
+        )
+        if not unchanged:
+            tmp_path = directory / (RNG_FILENAME + ".tmp")
+            with open(tmp_path, 'wb') as f:  # File object: np.savez would append .npz to a path
+                np.savez(f, name=name, keys=keys, pos=pos, has_gauss=has_gauss, cached_gaussian=cached_gaussian)
+                f.flush()
+                os.fsync(f.fileno())  # On disk before the state JSON that refers to it
+            os.replace(tmp_path, rng_path)
+            _last_random_state[rng_path] = ((name, pos, has_gauss, cached_gaussian), np.array(keys))
+    else:
+        # No RNG state in this checkpoint: drop one left over from an earlier run
+        rng_path = directory / RNG_FILENAME
+        _last_random_state.pop(rng_path, None)
+        if rng_path.exists():
+            rng_path.unlink()
+
+    state_path = directory / STATE_FILENAME
+    tmp_path = directory / (STATE_FILENAME + ".tmp")
+    with open(tmp_path, 'w') as f:
+        f.write(json.dumps(state, indent=2))  # One write call
+        f.flush()
+        os.fsync(f.fileno())  # On disk before it becomes the current checkpoint
+    if state_path.exists():
+        os.replace(state_path, directory / PREV_STATE_FILENAME)
+    os.replace(tmp_path, state_path)
+
+    return state_path
+
+
+def _read_state(path: Path) -> Dict[str, Any]:
+    """Read a checkpoint state JSON (None if missing or unreadable)."""
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def load_checkpoint(output_dir: str = DEFAULT_CHECKPOINT_DIR) -> Dict[str, Any]:
+    """
+    Load checkpoint saved by save_checkpoint() (or a legacy checkpoint_latest.pkl).
+
+    Args:
+        output_dir: Directory containing the checkpoint files
+
+    Returns:
+        Checkpoint dict ('best_params' as np.ndarray, 'random_state' as
+        np.random.get_state() tuple or None if not saved)
+
+    Raises:
+        FileNotFoundError: If no checkpoint found
+    """
+    directory = Path(output_dir)
+    state_path = directory / STATE_FILENAME
+
+    checkpoint = _read_state(state_path)
+    if checkpoint is None:
+        prev_path = directory / PREV_STATE_FILENAME
+        checkpoint = _read_state(prev_path)
+        if checkpoint is not None and state_path.exists():
+            print(f"[Checkpoint] WARNING: {state_path} is unreadable, using previous checkpoint {prev_path}")
+
+    if checkpoint is None:
+        legacy_path = directory / LEGACY_FILENAME
+        if legacy_path.exists():
+            print(f"[Checkpoint] Loading legacy pickle checkpoint: {legacy_path}")
+            import pickle  # Legacy format only
+            with open(legacy_path, 'rb') as f:
+                return pickle.load(f)
+        raise FileNotFoundError(f"Checkpoint not found: {state_path}")
+
+    if checkpoint.get('best_params') is not None:
+        checkpoint['best_params'] = np.array(checkpoint['best_params'], dtype=np.float64)
+
+    checkpoint['random_state'] = None
+    rng_path = directory / RNG_FILENAME
+    if rng_path.exists():
+        with np.load(rng_path, allow_pickle=False) as rng:
+            checkpoint['random_state'] = (
+                str(rng['name']), rng['keys'], int(rng['pos']),
+                int(rng['has_gauss']), float(rng['cached_gaussian'])
+            )
+
+    return checkpoint
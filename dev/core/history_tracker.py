@@ -5,16 +5,29 @@ Tracks evaluation results and saves to CSV file for later analysis.
 """
 
 import csv
+import os
+import queue
+import threading
+import warnings
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime
 import numpy as np
 
 # Import parameter names from export_to_unity
 import sys
-sys.path.append(str(Path(__file__).parent.parent))
+_DEV_DIR = str(Path(__file__).parent.parent)
+if _DEV_DIR not in sys.path:  # Already there when run as a dev/ script
+    sys.path.append(_DEV_DIR)
 from export_to_unity import PARAMETER_NAMES
 
+# Writer thread commands (everything else on the queue is a CSV row)
+_FLUSH = object()
+_STOP = object()
+
+# Read buffer for history CSVs (a few hundred KB per 1000 rows)
+_CSV_BUFFER_SIZE = 1 << 20
+
 
 class OptimizationHistory:
     """
@@ -23,13 +36,22 @@ class OptimizationHistory:
     Creates CSV file with header and appends each evaluation result.
     Used by optimizers to track progress during optimization.
 
+    The CSV file stays open for the lifetime of the tracker and rows are
+    written by a background thread, so a slow disk never delays the next
+    evaluation. flush() waits until all queued rows are on disk; call
+    close() when done. A write error in the background thread (e.g. disk
+    full) stops writing and is raised from the next add_evaluation(),
+    flush() or close(), so the run stops instead of dropping rows.
+
     Example:
         history = OptimizationHistory("data/output/optimization_history.csv")
         history.add_evaluation(iteration=1, objective=4.5, params=param_array)
         best = history.get_best()
+        history.close()
     """
 
-    def __init__(self, output_path: str, append: bool = False, start_iteration: int = 0):
+    def __init__(self, output_path: str, append: bool = False, start_iteration: int = 0,
+                 total_evals: int = 0, flush_every: int = 1):
         """
         Initialize history tracker.
 
@@ -37,21 +59,51 @@ class OptimizationHistory:
             output_path: Path to CSV file (will be created if doesn't exist)
             append: If True, append to existing file (resume mode)
             start_iteration: Starting iteration number (for resume)
+            total_evals: Expected number of evaluations (preallocates in-memory history, grows if exceeded)
+            flush_every: Flush CSV to disk every N rows and at every generation change
+                         (default: 1 = every evaluation). Optimizers also call flush()
+                         before the checkpoint at the end of each generation.
         """
         self.output_path = Path(output_path)
-        self.history = []
+
+        # In-memory history as parallel arrays, one slot per evaluation
+        # (CSV keeps the full record including metrics at full precision).
+        # Objectives stay float64 so best selection matches the CSV exactly;
+        # parameters are only mirrored for inspection and kept as float32.
+        capacity = max(total_evals, 1)
+        self._objectives = np.full(capacity, np.inf, dtype=np.float64)
+        self._params = np.empty((capacity, len(PARAMETER_NAMES)), dtype=np.float32)
+        self._iterations = np.empty(capacity, dtype=np.int64)
+        self._generations = np.empty(capacity, dtype=np.int64)
+        self._timestamps = []
+        self._n = 0
+
+        self.generation_bests = {}  # generation -> best objective in that generation
         self.start_iteration = start_iteration
 
+        self.flush_every = max(1, flush_every)
+        self._unflushed = 0
+        self._last_generation = None
+
         if append and self.output_path.exists():
             # Append mode: skip header, existing file preserved
             print(f"[History] Appending to existing file: {output_path}")
+            self._fh = open(self.output_path, 'a', newline='')
+            self._writer = csv.writer(self._fh)
         else:
             # New file mode: create with header
-            with open(self.output_path, 'w', newline='') as f:
-                writer = csv.writer(f)
-                header = ['iteration', 'generation', 'timestamp', 'objective',
-                          'mean_error', 'percentile_95', 'time_growth', 'density_diff'] + PARAMETER_NAMES
-                writer.writerow(header)
+            self._fh = open(self.output_path, 'w', newline='')
+            self._writer = csv.writer(self._fh)
+            header = ['iteration', 'generation', 'timestamp', 'objective',
+                      'mean_error', 'percentile_95', 'time_growth', 'density_diff'] + PARAMETER_NAMES
+            self._writer.writerow(header)
+            self._fh.flush()
+
+        self._write_error = None  # OSError from the writer thread, raised in the caller
+        self._write_error_reported = False
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._write_rows, name="HistoryWriter", daemon=True)
+        self._thread.start()
 
     def add_evaluation(self, iteration: int, objective: float, params: np.ndarray,
                       metrics: Dict[str, Any] = None, generation: int = 0):
@@ -65,19 +117,27 @@ class OptimizationHistory:
             metrics: Optional dict with individual metrics (mean_error, percentile_95, time_growth, density_diff)
             generation: Generation number (0 if not applicable)
         """
+        self._raise_write_error()
+
         # Adjust iteration number for resume mode
         actual_iteration = self.start_iteration + iteration
 
         timestamp = datetime.now().isoformat()
-        entry = {
-            'iteration': actual_iteration,
-            'generation': generation,
-            'timestamp': timestamp,
-            'objective': objective,
-            'params': params.tolist(),
-            'metrics': metrics
-        }
-        self.history.append(entry)
+
+        # Store in preallocated arrays (grow if more evaluations than expected)
+        if self._n == len(self._objectives):
+            self._grow()
+        k = self._n
+        self._objectives[k] = objective
+        self._params[k] = params
+        self._iterations[k] = actual_iteration
+        self._generations[k] = generation
+        self._timestamps.append(timestamp)
+        self._n += 1
+
+        # Track best objective per generation (for plateau detection)
+        if generation not in self.generation_bests or objective < self.generation_bests[generation]:
+            self.generation_bests[generation] = objective
 
         # Extract individual metrics (with defaults for backward compatibility)
         if metrics is not None:
@@ -88,23 +148,227 @@ class OptimizationHistory:
         else:
             mean_error = percentile_95 = time_growth = density_diff = 0.0
 
-        # Append to CSV
-        with open(self.output_path, 'a', newline='') as f:
-            writer = csv.writer(f)
-            row = [actual_iteration, generation, timestamp, objective,
-                   mean_error, percentile_95, time_growth, density_diff] + params.tolist()
-            writer.writerow(row)
+        # Rows of a finished generation are not held back behind the next one
+        # (the end-of-generation checkpoint flushes as well)
+        if generation != self._last_generation and self._unflushed:
+            self._queue.put(_FLUSH)
+            self._unflushed = 0
+        self._last_generation = generation
+
+        # Hand the row to the writer thread (flushed to disk every flush_every rows)
+        row = [actual_iteration, generation, timestamp, objective,
+               mean_error, percentile_95, time_growth, density_diff] + params.tolist()
+        self._queue.put(row)
+        self._unflushed += 1
+        if self._unflushed >= self.flush_every:
+            self._queue.put(_FLUSH)
+            self._unflushed = 0
+
+    def flush(self):
+        """Write all queued rows and flush the CSV to disk (blocks until done)."""
+        if self._thread.is_alive():
+            self._queue.put(_FLUSH)
+            self._queue.join()
+        self._unflushed = 0
+        self._raise_write_error()
+
+    def close(self):
+        """Write all queued rows, then stop the writer thread and close the CSV file."""
+        if self._thread.is_alive():
+            self._queue.put(_STOP)
+            self._thread.join()
+        if not self._fh.closed:
+            try:
+                self._fh.close()
+            except OSError:
+                if self._write_error is None:
+                    raise
+                # Unwritable buffered rows of the failure below
+        if not self._write_error_reported:
+            self._raise_write_error()  # close() after a handled error must not mask it
+
+    def _raise_write_error(self):
+        """Re-raise a write error from the writer thread (every call after it failed)."""
+        if self._write_error is not None:
+            self._write_error_reported = True
+            raise self._write_error
+
+    def _write_rows(self):
+        """Writer thread: append queued rows to the CSV until close() or a write error."""
+        while True:
+            item = self._queue.get()
+            try:
+                if item is _STOP:
+                    self._fh.flush()
+                    return
+                if item is _FLUSH:
+                    self._fh.flush()
+                else:
+                    self._writer.writerow(item)
+            except OSError as e:
+                # Stop writing; the caller gets the error from its next history call
+                print(f"[History] ERROR: Failed to write {self.output_path}: {e}")
+                self._write_error = e
+                self._drain()
+                return
+            finally:
+                self._queue.task_done()
+
+    def _drain(self):
+        """Discard queued items after a write error so flush() does not block."""
+        while True:
+            try:
+                self._queue.get_nowait()
+            except queue.Empty:
+                return
+            self._queue.task_done()
+
+    def _grow(self):
+        """Double the capacity of the in-memory history arrays."""
+        capacity = 2 * len(self._objectives)
+        self._objectives = np.resize(self._objectives, capacity)
+        self._params = np.resize(self._params, (capacity, self._params.shape[1]))
+        self._iterations = np.resize(self._iterations, capacity)
+        self._generations = np.resize(self._generations, capacity)
 
     def get_best(self) -> Dict[str, Any]:
         """
         Get best evaluation so far.
 
+        Note:
+            'params' comes from the float32 in-memory copy (~7 significant digits).
+            Use the CSV row when exact values are needed (e.g. for export to Unity).
+
         Returns:
-            Dictionary with best evaluation data (iteration, objective, params)
+            Dictionary with best evaluation data (iteration, generation, timestamp, objective, params)
             Returns None if no evaluations recorded yet
         """
-        if not self.history:
+        if self._n == 0:
             return None
 
-        best = min(self.history, key=lambda x: x['objective'])
-        return best
+        k = int(self._objectives[:self._n].argmin())
+        return {
+            'iteration': int(self._iterations[k]),
+            'generation': int(self._generations[k]),
+            'timestamp': self._timestamps[k],
+            'objective': float(self._objectives[k]),
+            'params': self._params[k].astype(np.float64)
+        }
+
+    def has_plateaued(self, generations: int, eps: float = 0.0) -> bool:
+        """
+        Check whether the running best has stopped improving.
+
+        Compares the best objective of the last `generations` generations
+        against the best objective of all generations before them.
+
+        Args:
+            generations: Number of trailing generations to inspect
+            eps: Minimum improvement that counts as progress
+
+        Returns:
+            True if the trailing generations improved the running best by less than eps
+        """
+        recorded = sorted(self.generation_bests)
+        if generations <= 0 or len(recorded) <= generations:
+            return False  # Not enough generations to judge
+
+        best_before = min(self.generation_bests[g] for g in recorded[:-generations])
+        best_recent = min(self.generation_bests[g] for g in recorded[-generations:])
+        return (best_before - best_recent) < eps
+
+
+def _read_csv_columns(csv_path: Path, columns: Optional[List[str]] = None) -> Tuple[List[str], np.ndarray]:
+    """
+    Parse numeric columns of a history CSV (header via csv, rows straight into numpy).
+
+    Args:
+        csv_path: History CSV written by OptimizationHistory
+        columns: Column names to load (None = every column except 'timestamp')
+
+    Returns:
+        (column names, float64 array of shape (n_rows, len(column names)))
+    """
+    with open(csv_path, 'r', newline='', encoding='utf-8', buffering=_CSV_BUFFER_SIZE) as f:
+        header = next(csv.reader(f), [])
+        if columns is None:
+            columns = [name for name in header if name != 'timestamp']
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', UserWarning)  # Header-only file (no evaluations yet)
+            data = np.loadtxt(f, delimiter=',', ndmin=2, dtype=np.float64,
+                              usecols=[header.index(name) for name in columns])
+    return list(columns), data
+
+
+def load_history_columns(csv_path: str, columns: Optional[List[str]] = None) -> Tuple[Dict[str, int], np.ndarray]:
+    """
+    Load numeric columns of a history CSV into a 2D float64 array.
+
+    Reads the .npz mirror written by write_history_npz() when it is up to date,
+    otherwise parses the CSV (timestamp column skipped).
+
+    Args:
+        csv_path: History CSV written by OptimizationHistory
+        columns: Column names to load, in this order (None = every column except 'timestamp')
+
+    Returns:
+        (column name -> column index in data, data array of shape (n_rows, n_columns))
+    """
+    csv_path = Path(csv_path)
+    npz_path = csv_path.with_suffix('.npz')
+    if npz_path.exists() and npz_path.stat().st_mtime_ns >= csv_path.stat().st_mtime_ns:
+        with np.load(npz_path, allow_pickle=False) as npz:
+            stored = npz['columns'].tolist()
+            if columns is None:
+                return {name: i for i, name in enumerate(stored)}, npz['data']
+            if all(name in stored for name in columns):
+                data = npz['data'][:, [stored.index(name) for name in columns]]
+                return {name: i for i, name in enumerate(columns)}, data
+
+    names, data = _read_csv_columns(csv_path, columns)
+    return {name: i for i, name in enumerate(names)}, data
+
+
+def load_population_from_history(csv_path: str, n_members: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Load the best evaluated parameter sets from a history CSV (warm start on resume).
+
+    Args:
+        csv_path: History CSV written by OptimizationHistory
+        n_members: Maximum number of members to return
+
+    Returns:
+        (population, energies): shapes (M, n_params) and (M,), best first, M <= n_members
+    """
+    columns, data = load_history_columns(csv_path)
+    if 'objective' not in columns:
+        return np.empty((0, len(PARAMETER_NAMES))), np.empty(0)
+
+    objectives = data[:, columns['objective']]
+    best = np.argsort(objectives, kind='stable')[:n_members]
+    return data[np.ix_(best, [columns[name] for name in PARAMETER_NAMES])], objectives[best]
+
+
+def write_history_npz(csv_path: str) -> Path:
+    """
+    Write a binary mirror of the numeric history columns next to the CSV.
+
+    The mirror (same name, .npz) lets load_history_columns() skip text parsing.
+    It is only used while it is newer than the CSV, so a CSV appended to later
+    (e.g. by a resumed run) is read directly again.
+
+    Args:
+        csv_path: History CSV written by OptimizationHistory
+
+    Returns:
+        Path to the .npz file
+    """
+    csv_path = Path(csv_path)
+    columns, data = _read_csv_columns(csv_path)
+
+    npz_path = csv_path.with_suffix('.npz')
+    tmp_path = csv_path.with_name(npz_path.name + ".tmp")
+    with open(tmp_path, 'wb') as f:  # File object: np.savez would append .npz to a path
+        np.savez(f, columns=np.array(columns), data=data)
+    os.replace(tmp_path, npz_path)
+    return npz_path
@@ -6,16 +6,27 @@ Provides a callable interface that optimizers can use.
 """
 
 import sys
+import json
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Tuple
 import numpy as np
 
 # Import from existing scripts
-sys.path.append(str(Path(__file__).parent.parent))
+_DEV_DIR = str(Path(__file__).parent.parent)
+if _DEV_DIR not in sys.path:  # Already there when run as a dev/ script
+    sys.path.append(_DEV_DIR)
 from evaluate_objective import load_simulation_result, evaluate_objective
 from core.unity_simulator import UnitySimulator
 
 
+def eval_experiment_id(eval_id: int) -> str:
+    """Experiment ID for an evaluation number (e.g. 12 -> "eval_0012")."""
+    return f"eval_{eval_id:04d}"
+
+
 class ObjectiveFunction:
     """
     Callable objective function for parameter optimization.
@@ -38,7 +49,8 @@ class ObjectiveFunction:
         self,
         unity_simulator: UnitySimulator,
         history_tracker: Optional[Any] = None,
-        verbose: bool = True
+        verbose: bool = True,
+        cache_path: Optional[str] = None
     ):
         """
         Initialize objective function.
@@ -47,6 +59,8 @@ class ObjectiveFunction:
             unity_simulator: UnitySimulator instance for running simulations
             history_tracker: Optional history tracker (e.g., OptimizationHistory)
             verbose: Print detailed evaluation info
+            cache_path: Optional JSONL file caching results of evaluated parameter sets
+                (default: None = always run Unity)
         """
         self.simulator = unity_simulator
         self.history = history_tracker
@@ -56,6 +70,13 @@ class ObjectiveFunction:
         self.current_generation = 0  # Track current generation
         self.evaluations = []  # Store all evaluations
 
+        # Result cache: rounded params tuple -> (objective, metrics)
+        self.cache_path = Path(cache_path) if cache_path else None
+        self._cache = None
+        self._cache_lock = threading.Lock()
+        if self.cache_path is not None:
+            self._cache = self._load_cache(self.cache_path)
+
     def set_generation(self, generation: int):
         """
         Set current generation number (called by optimizer).
@@ -111,14 +132,89 @@ class ObjectiveFunction:
         """
         self.eval_count += 1
 
+        objective, metrics = self._evaluate(params, self.eval_count)
+        self._record(params, self.eval_count, objective, metrics)
+
+        return objective
+
+    @staticmethod
+    def _cache_key(params: np.ndarray) -> Tuple[float, ...]:
+        """Cache key: parameters rounded to 6 decimals."""
+        return tuple(np.round(params, 6).tolist())
+
+    @staticmethod
+    def _load_cache(cache_path: Path) -> Dict[Tuple[float, ...], Tuple[float, Dict[str, float]]]:
+        """
+        Load cached evaluations from JSONL file (one evaluation per line).
+
+        Args:
+            cache_path: Path to cache file (missing file = empty cache)
+
+        Returns:
+            Dictionary mapping cache key to (objective, metrics)
+        """
+        cache = {}
+        if cache_path.exists():
+            with open(cache_path, 'r') as f:
+                for line in f:
+                    if line.strip():
+                        entry = json.loads(line)
+                        cache[tuple(entry['params'])] = (entry['objective'], entry['metrics'])
+            print(f"[ObjectiveFunction] Loaded {len(cache)} cached evaluations: {cache_path}")
+        return cache
+
+    def _evaluate(self, params: np.ndarray, eval_id: int) -> Tuple[float, Dict[str, float]]:
+        """
+        Get objective for params from the cache, or run a simulation.
+
+        Args:
+            params: Parameter array (18 values)
+            eval_id: Evaluation number
+
+        Returns:
+            (objective, metrics)
+        """
+        if self._cache is None:
+            return self._run(params, eval_id)
+
+        key = self._cache_key(params)
+        cached = self._cache.get(key)
+        if cached is not None:
+            objective, metrics = cached
+            if self.verbose:
+                print(f"[ObjectiveFunction] Evaluation {eval_id}: cache hit, Unity skipped (objective {objective:.4f})")
+            return objective, dict(metrics)
+
+        objective, metrics = self._run(params, eval_id)
+
+        with self._cache_lock:
+            self._cache[key] = (objective, dict(metrics))
+            with open(self.cache_path, 'a') as f:
+                f.write(json.dumps({'params': list(key), 'objective': objective, 'metrics': metrics}) + '\n')
+
+        return objective, metrics
+
+    def _run(self, params: np.ndarray, eval_id: int) -> Tuple[float, Dict[str, float]]:
+        """Run one simulation on this objective's Unity simulator."""
+        return self._simulate(params, eval_id, self.simulator)
+
+    def _simulate(self, params: np.ndarray, eval_id: int, simulator: UnitySimulator) -> Tuple[float, Dict[str, float]]:
+        """
+        Run one Unity simulation and compute its objective.
+
+        Args:
+            params: Parameter array (18 values)
+            eval_id: Evaluation number (used for experiment ID eval_XXXX)
+            simulator: UnitySimulator to run on
+
+        Returns:
+            (objective, metrics)
+        """
         if self.verbose:
-            print(f"\n{'='*80}")
-            print(f"EVALUATION {self.eval_count}")
-            print(f"{'='*80}")
+            print(f"\n{'='*80}\nEVALUATION {eval_id}\n{'='*80}")
 
         # Run Unity simulation
-        experiment_id = f"eval_{self.eval_count:04d}"
-        result_path = self.simulator.run_simulation(params, experiment_id)
+        result_path = simulator.run_simulation(params, eval_experiment_id(eval_id))
 
         # Load result
         if self.verbose:
@@ -130,37 +226,49 @@ class ObjectiveFunction:
         objective, metrics = evaluate_objective(result_data)
 
         if self.verbose:
-            print(f"\n{'='*80}")
-            print(f"EVALUATION {self.eval_count} - RESULTS")
-            print(f"{'='*80}")
-            print(f"Objective:      {objective:.4f}")
-            print(f"RMSE:           {metrics['mean_error']:.4f}")
-            print(f"Percentile95:   {metrics['percentile_95']:.4f}")
-            print(f"TimeGrowth:     {metrics['time_growth']:.4f}")
-            print(f"DensityDiff:    {metrics['density_diff']:.4f}")
-            print(f"{'='*80}\n")
-
-        # Track history
+            # Build the banner once and write it in a single call
+            print("\n".join([
+                f"\n{'='*80}",
+                f"EVALUATION {eval_id} - RESULTS",
+                f"{'='*80}",
+                f"Objective:      {objective:.4f}",
+                f"RMSE:           {metrics['mean_error']:.4f}",
+                f"Percentile95:   {metrics['percentile_95']:.4f}",
+                f"TimeGrowth:     {metrics['time_growth']:.4f}",
+                f"DensityDiff:    {metrics['density_diff']:.4f}",
+                f"{'='*80}\n"
+            ]))
+
+        return objective, metrics
+
+    def _record(self, params: np.ndarray, eval_id: int, objective: float, metrics: Dict[str, float]):
+        """
+        Record an evaluation in memory and in the history tracker.
+
+        Args:
+            params: Parameter array (18 values)
+            eval_id: Evaluation number
+            objective: Objective value
+            metrics: Individual metric values
+        """
         evaluation_record = {
-            'iteration': self.eval_count,
+            'iteration': eval_id,
             'params': params.copy(),
             'objective': objective,
             'metrics': metrics.copy(),
-            'experiment_id': experiment_id
+            'experiment_id': eval_experiment_id(eval_id)
         }
         self.evaluations.append(evaluation_record)
 
         if self.history is not None:
             self.history.add_evaluation(
-                iteration=self.eval_count,
+                iteration=eval_id,
                 objective=objective,
                 params=params,
                 metrics=metrics,  # Pass individual metrics to history tracker
                 generation=self.current_generation  # Pass generation number
             )
 
-        return objective
-
     def get_best_evaluation(self) -> Dict[str, Any]:
         """
         Get best evaluation so far.
@@ -192,6 +300,130 @@ class ObjectiveFunction:
         self.eval_count = 0
         self.evaluations.clear()
 
+    def close(self, abort: bool = False):
+        """
+        Release evaluation resources.
+
+        Args:
+            abort: Stop a simulation that is still running (Ctrl+C / SIGTERM / error)
+        """
+        if abort:
+            self.simulator.stop()
+
+
+class ParallelObjectiveFunction(ObjectiveFunction):
+    """
+    Objective function that runs a batch of candidates on several Unity instances at once.
+
+    Each UnitySimulator must point to its own Unity project (clone), so that
+    parameter/result/trigger files do not collide. Python only waits on Unity
+    while a simulation runs, so simulations are dispatched from a thread pool
+    that lives as long as the objective function (call close() when done).
+
+    Optimizers detect evaluate_batch() and hand over a whole generation.
+    Single-candidate calls (__call__) run on the first simulator.
+
+    Example:
+        simulators = [UnitySimulator(project_path=p) for p in project_clones]
+        obj_func = ParallelObjectiveFunction(simulators, history_tracker=history)
+
+        objectives = obj_func.evaluate_batch(population)  # (S, 18) -> (S,)
+    """
+
+    def __init__(
+        self,
+        unity_simulators: List[UnitySimulator],
+        history_tracker: Optional[Any] = None,
+        verbose: bool = True,
+        cache_path: Optional[str] = None
+    ):
+        """
+        Initialize parallel objective function.
+
+        Args:
+            unity_simulators: One UnitySimulator per Unity project clone (= number of workers)
+            history_tracker: Optional history tracker (e.g., OptimizationHistory)
+            verbose: Print detailed evaluation info
+            cache_path: Optional JSONL file caching results of evaluated parameter sets
+        """
+        super().__init__(unity_simulators[0], history_tracker, verbose, cache_path)
+        self.simulators = unity_simulators
+
+        # Pool of idle simulators (each simulation borrows one)
+        self._idle = queue.Queue()
+        for simulator in unity_simulators:
+            self._idle.put(simulator)
+
+        # One dispatcher thread per Unity instance, reused for every generation
+        self._executor = ThreadPoolExecutor(max_workers=len(unity_simulators))
+
+    def evaluate_batch(self, params_batch: np.ndarray) -> np.ndarray:
+        """
+        Evaluate a batch of candidates concurrently.
+
+        Evaluation numbers are assigned in batch order before dispatch, and
+        results are recorded to history in that order once all are done.
+        If a simulation fails, the other simulations still run to completion
+        and every successful one is recorded before the first error is
+        re-raised (also on Ctrl+C, for the simulations finished so far).
+
+        Args:
+            params_batch: Candidate matrix, shape (S, 18)
+
+        Returns:
+            Objective values, shape (S,)
+        """
+        eval_ids = range(self.eval_count + 1, self.eval_count + 1 + len(params_batch))
+        self.eval_count += len(params_batch)
+
+        futures = [self._executor.submit(self._evaluate, params, eval_id)
+                   for params, eval_id in zip(params_batch, eval_ids)]
+
+        objectives = np.full(len(futures), np.nan)
+        first_error = None
+        try:
+            wait(futures)
+        finally:
+            for i, (params, eval_id, future) in enumerate(zip(params_batch, eval_ids, futures)):
+                if not future.done() or future.cancelled():
+                    continue
+                error = future.exception()
+                if error is not None:
+                    first_error = first_error or error
+                    continue
+                objective, metrics = future.result()
+                self._record(params, eval_id, objective, metrics)
+                objectives[i] = objective
+
+        if first_error is not None:
+            raise first_error
+
+        return objectives
+
+    def _run(self, params: np.ndarray, eval_id: int) -> Tuple[float, Dict[str, float]]:
+        """Run one simulation on the next idle Unity instance."""
+        simulator = self._idle.get()
+        try:
+            return self._simulate(params, eval_id, simulator)
+        finally:
+            self._idle.put(simulator)
+
+    def close(self, abort: bool = False):
+        """
+        Shut down the dispatcher thread pool.
+
+        Args:
+            abort: Do not wait for running simulations: cancel queued ones and
+                   stop every Unity instance (Ctrl+C / SIGTERM / error).
+                   Otherwise wait until running simulations are done.
+        """
+        if abort:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            for simulator in self.simulators:
+                simulator.stop()
+        else:
+            self._executor.shutdown(wait=True)
+
 
 def test_objective_function():
     """
@@ -13,9 +13,17 @@ from typing import Dict, List, Tuple
 import numpy as np
 
 # Import from existing scripts
-sys.path.append(str(Path(__file__).parent.parent))
+_DEV_DIR = str(Path(__file__).parent.parent)
+if _DEV_DIR not in sys.path:  # Already there when run as a dev/ script
+    sys.path.append(_DEV_DIR)
 from export_to_unity import PARAMETER_BOUNDS, PARAMETER_NAMES
 
+# Bounds in PARAMETER_NAMES order, built once at import
+_BOUNDS = [PARAMETER_BOUNDS[name] for name in PARAMETER_NAMES]
+_BOUNDS_ARRAY = np.array(_BOUNDS, dtype=np.float64)  # shape (18, 2)
+_BMIN = _BOUNDS_ARRAY[:, 0]
+_BMAX = _BOUNDS_ARRAY[:, 1]
+
 
 def load_parameter_bounds() -> List[Tuple[float, float]]:
     """
@@ -24,8 +32,7 @@ def load_parameter_bounds() -> List[Tuple[float, float]]:
     Returns:
         List of (min, max) tuples for each parameter in order
     """
-    bounds = [PARAMETER_BOUNDS[name] for name in PARAMETER_NAMES]
-    return bounds
+    return list(_BOUNDS)
 
 
 def params_array_to_dict(params: np.ndarray) -> Dict[str, float]:
@@ -49,7 +56,8 @@ def params_array_to_dict(params: np.ndarray) -> Dict[str, float]:
             f"Expected {len(PARAMETER_NAMES)} parameters, got {len(params)}"
         )
 
-    return {name: float(params[i]) for i, name in enumerate(PARAMETER_NAMES)}
+    # ndarray.tolist() converts to Python floats in C (no per-element float() calls)
+    return dict(zip(PARAMETER_NAMES, np.asarray(params, dtype=np.float64).tolist()))
 
 
 def params_dict_to_array(params_dict: Dict[str, float]) -> np.ndarray:
@@ -68,7 +76,8 @@ def params_dict_to_array(params_dict: Dict[str, float]) -> np.ndarray:
         >>> params[0]
         0.2
     """
-    params = np.array([params_dict[name] for name in PARAMETER_NAMES])
+    params = np.fromiter((params_dict[name] for name in PARAMETER_NAMES),
+                         dtype=np.float64, count=len(PARAMETER_NAMES))
     return params
 
 
@@ -82,16 +91,7 @@ def validate_and_clamp_params(params: np.ndarray) -> np.ndarray:
     Returns:
         Clamped parameter array (all values within bounds)
     """
-    bounds = load_parameter_bounds()
-    clamped = params.copy()
-
-    for i, (low, high) in enumerate(bounds):
-        if clamped[i] < low:
-            clamped[i] = low
-        elif clamped[i] > high:
-            clamped[i] = high
-
-    return clamped
+    return np.clip(params, _BMIN, _BMAX)
 
 
 def get_baseline_parameters() -> Dict[str, float]:
@@ -26,12 +26,22 @@ import subprocess
 import glob
 import json
 import shutil
+import threading
 from pathlib import Path
-from typing import Optional
+from typing import Any, Optional, Tuple
 import numpy as np
 
+# Optional: watchdog wakes the result poll as soon as Unity writes (falls back to plain polling)
+try:
+    from watchdog.observers import Observer
+    from watchdog.events import FileSystemEventHandler
+except ImportError:
+    Observer = None
+
 # Import from existing scripts
-sys.path.append(str(Path(__file__).parent.parent))
+_DEV_DIR = str(Path(__file__).parent.parent)
+if _DEV_DIR not in sys.path:  # Already there when run as a dev/ script
+    sys.path.append(_DEV_DIR)
 from export_to_unity import export_to_unity_json, generate_experiment_id
 from core.parameter_utils import params_array_to_dict
 
@@ -54,7 +64,8 @@ class UnitySimulator:
         unity_editor_path: Optional[str] = None,
         project_path: Optional[str] = None,
         timeout: int = 600,
-        use_file_trigger: bool = True
+        use_file_trigger: bool = True,
+        verbose: bool = True
     ):
         """
         Initialize Unity simulator.
@@ -65,8 +76,10 @@ class UnitySimulator:
             timeout: Timeout in seconds for simulation completion (default: 600 = 10min)
             use_file_trigger: Use file trigger instead of subprocess (default: True)
                              If True, Unity Editor must be already open
+            verbose: Print per-simulation progress (errors and warnings are always printed)
         """
         self.use_file_trigger = use_file_trigger
+        self.verbose = verbose
         self.project_path = project_path or r"D:\UnityProjects\META_VERYOLD_P01_s"
         self.timeout = timeout
 
@@ -80,12 +93,20 @@ class UnitySimulator:
         self.input_dir = Path(self.project_path) / "Assets/StreamingAssets/Calibration/Input"
         self.output_dir = Path(self.project_path) / "Assets/StreamingAssets/Calibration/Output"
         self.result_file = None  # Will be set dynamically per simulation
+        self._process = None  # Unity subprocess of the running simulation (subprocess mode)
+        self._stop_event = threading.Event()  # Set by stop() to abort the running simulation
         self.trigger_file = Path(self.project_path) / "Assets/StreamingAssets/Calibration/trigger_simulation.txt"
 
-        # Ensure directories exist
+        # Archive directories (per-experiment copies of inputs and results)
+        self.archive_input_dir = Path("data/input/parameters")
+        self.archive_result_dir = Path("data/output/results")
+
+        # Ensure directories exist (once, not per simulation)
         self.input_dir.mkdir(parents=True, exist_ok=True)
         self.output_dir.mkdir(parents=True, exist_ok=True)
         self.trigger_file.parent.mkdir(parents=True, exist_ok=True)
+        self.archive_input_dir.mkdir(parents=True, exist_ok=True)
+        self.archive_result_dir.mkdir(parents=True, exist_ok=True)
 
         print(f"[UnitySimulator] Initialized")
         if self.use_file_trigger:
@@ -97,6 +118,11 @@ class UnitySimulator:
         print(f"  Project:      {self.project_path}")
         print(f"  Timeout:      {self.timeout}s")
 
+    def _log(self, message: str):
+        """Print a progress message (one write per call) if verbose."""
+        if self.verbose:
+            print(message)
+
     def _find_unity_editor(self) -> str:
         """
         Find Unity Editor executable automatically.
@@ -183,9 +209,7 @@ class UnitySimulator:
         if experiment_id is None:
             experiment_id = generate_experiment_id(prefix="auto")
 
-        print(f"\n{'='*80}")
-        print(f"[UnitySimulator] Starting simulation: {experiment_id}")
-        print(f"{'='*80}")
+        self._log(f"\n{'='*80}\n[UnitySimulator] Starting simulation: {experiment_id}\n{'='*80}")
 
         # Step 1: Export parameters to Unity JSON (fixed filename)
         param_dict = params_array_to_dict(params)
@@ -196,18 +220,16 @@ class UnitySimulator:
             output_path=str(input_file),
             experiment_id=experiment_id
         )
-        print(f"[UnitySimulator] Parameters exported: {input_file.name}")
+        self._log(f"[UnitySimulator] Parameters exported: {input_file.name}")
 
         # Archive input parameters to data/input/parameters/
-        archive_input_dir = Path("data/input/parameters")
-        archive_input_dir.mkdir(parents=True, exist_ok=True)
-        archive_input_file = archive_input_dir / f"{experiment_id}_parameters.json"
+        archive_input_file = self.archive_input_dir / f"{experiment_id}_parameters.json"
         shutil.copy2(input_file, archive_input_file)
-        print(f"[UnitySimulator] Archived input: {archive_input_file}")
+        self._log(f"[UnitySimulator] Archived input: {archive_input_file}")
 
         # Set result file path (fixed filename for Unity)
         self.result_file = self.output_dir / "current_result.json"  # Fixed filename for Unity
-        print(f"[UnitySimulator] Expected result file: {self.result_file.name}")
+        self._log(f"[UnitySimulator] Expected result file: {self.result_file.name}")
 
         # Store experiment_id for later archiving
         self.current_experiment_id = experiment_id
@@ -215,19 +237,22 @@ class UnitySimulator:
         # Step 2: Delete old result file (and .meta file if exists)
         if self.result_file.exists():
             self.result_file.unlink()
-            print(f"[UnitySimulator] Deleted old result file")
+            self._log(f"[UnitySimulator] Deleted old result file")
 
         # Delete .meta file to avoid Unity warning
         meta_file = Path(str(self.result_file) + ".meta")
         if meta_file.exists():
             meta_file.unlink()
-            print(f"[UnitySimulator] Deleted old .meta file")
+            self._log(f"[UnitySimulator] Deleted old .meta file")
 
         # Step 3: Launch Unity (mode-dependent)
+        if self._stop_event.is_set():
+            raise RuntimeError("Simulation stopped (optimization interrupted)")
         if self.use_file_trigger:
             process = self._trigger_unity_via_file()
         else:
             process = self._launch_unity_subprocess()
+        self._process = process
 
         # Step 4: Poll for result file
         try:
@@ -235,27 +260,25 @@ class UnitySimulator:
         except (TimeoutError, RuntimeError) as e:
             # Kill Unity if still running (subprocess mode only)
             if process is not None and process.poll() is None:
-                print(f"[UnitySimulator] Terminating Unity process...")
+                self._log(f"[UnitySimulator] Terminating Unity process...")
                 process.kill()
                 process.wait(timeout=10)
             raise e
 
         # Step 5: Terminate Unity process (subprocess mode only)
         if process is not None and process.poll() is None:
-            print(f"[UnitySimulator] Terminating Unity process...")
+            self._log(f"[UnitySimulator] Terminating Unity process...")
             process.terminate()
             process.wait(timeout=30)
+        self._process = None
 
         # Step 6: Archive result file to data/output/results/
-        archive_result_dir = Path("data/output/results")
-        archive_result_dir.mkdir(parents=True, exist_ok=True)
-        archive_result_file = archive_result_dir / f"{self.current_experiment_id}_result.json"
+        archive_result_file = self.archive_result_dir / f"{self.current_experiment_id}_result.json"
 
         shutil.copy2(str(self.result_file), str(archive_result_file))
-        print(f"[UnitySimulator] Archived result: {archive_result_file}")
+        self._log(f"[UnitySimulator] Archived result: {archive_result_file}")
 
-        print(f"[UnitySimulator] Simulation complete: {experiment_id}")
-        print(f"{'='*80}\n")
+        self._log(f"[UnitySimulator] Simulation complete: {experiment_id}\n{'='*80}\n")
 
         # Return archived file path (not Unity path)
         return str(archive_result_file)
@@ -269,16 +292,16 @@ class UnitySimulator:
         Returns:
             None (no subprocess, Unity already running)
         """
-        print(f"[UnitySimulator] Using file trigger mode")
-        print(f"[UnitySimulator] Creating trigger file...")
+        self._log(f"[UnitySimulator] Using file trigger mode")
+        self._log(f"[UnitySimulator] Creating trigger file...")
 
         # Ensure trigger directory exists
         self.trigger_file.parent.mkdir(parents=True, exist_ok=True)
 
         # Create trigger file
         self.trigger_file.write_text("TRIGGER")
-        print(f"[UnitySimulator] Trigger file created: {self.trigger_file.name}")
-        print(f"[UnitySimulator] Unity Editor should detect file and start simulation...")
+        self._log(f"[UnitySimulator] Trigger file created: {self.trigger_file.name}")
+        self._log(f"[UnitySimulator] Unity Editor should detect file and start simulation...")
 
         return None  # No process to manage
 
@@ -296,8 +319,8 @@ class UnitySimulator:
             "-logFile", "-"  # Log to stdout (captured by Popen)
         ]
 
-        print(f"[UnitySimulator] Launching Unity Editor as subprocess...")
-        print(f"[UnitySimulator] Method: Calibration_hybrid_AutomationController.RunCalibrationSimulation")
+        self._log(f"[UnitySimulator] Launching Unity Editor as subprocess...")
+        self._log(f"[UnitySimulator] Method: Calibration_hybrid_AutomationController.RunCalibrationSimulation")
 
         process = subprocess.Popen(
             cmd,
@@ -306,7 +329,7 @@ class UnitySimulator:
             text=True
         )
 
-        print(f"[UnitySimulator] Unity process started (PID: {process.pid})")
+        self._log(f"[UnitySimulator] Unity process started (PID: {process.pid})")
         return process
 
     def _wait_for_result(self, process: Optional[subprocess.Popen]):
@@ -320,23 +343,75 @@ class UnitySimulator:
             TimeoutError: If result file not created within timeout
             RuntimeError: If Unity process exits with error (subprocess mode only)
         """
-        print(f"[UnitySimulator] Waiting for result file...")
-        print(f"[UnitySimulator] Polling: {self.result_file}")
-        print(f"[UnitySimulator] Timeout: {self.timeout}s")
+        self._log(f"[UnitySimulator] Waiting for result file...\n"
+                  f"[UnitySimulator] Polling: {self.result_file}\n"
+                  f"[UnitySimulator] Timeout: {self.timeout}s")
 
         start_time = time.time()
         check_interval = 2  # seconds
 
+        observer, result_event = self._start_result_watcher()
+        try:
+            self._poll_for_result(process, start_time, check_interval, result_event)
+        finally:
+            if observer is not None:
+                observer.stop()
+                observer.join()
+
+    def _start_result_watcher(self) -> Tuple[Optional[Any], Optional[threading.Event]]:
+        """
+        Watch the output directory for changes to the result file (requires watchdog).
+
+        Returns:
+            (observer, event set on result file changes), or (None, None) if watchdog is not installed
+        """
+        if Observer is None:
+            return None, None
+
+        result_event = threading.Event()
+        result_name = self.result_file.name
+
+        class ResultFileHandler(FileSystemEventHandler):
+            def on_any_event(self, event):
+                paths = (event.src_path, getattr(event, 'dest_path', ''))
+                if any(os.path.basename(path) == result_name for path in paths):
+                    result_event.set()
+
+        observer = Observer()
+        observer.schedule(ResultFileHandler(), str(self.result_file.parent), recursive=False)
+        observer.start()
+        return observer, result_event
+
+    def _poll_for_result(
+        self,
+        process: Optional[subprocess.Popen],
+        start_time: float,
+        check_interval: float,
+        result_event: Optional[threading.Event]
+    ):
+        """
+        Poll loop of _wait_for_result().
+
+        Args:
+            process: Unity process to monitor (None if file trigger mode)
+            start_time: Time the wait started (time.time())
+            check_interval: Seconds between checks
+            result_event: Event set by the file watcher (None = sleep full interval)
+        """
         while True:
+            # Aborted by stop() (Ctrl+C / SIGTERM on the main thread)
+            if self._stop_event.is_set():
+                raise RuntimeError("Simulation stopped (optimization interrupted)")
+
             # Check if result file created and stable (file size not changing)
             if self.result_file.exists():
                 # Wait for file to stabilize (Unity still writing)
                 if self._is_file_stable(self.result_file):
                     elapsed = time.time() - start_time
-                    print(f"[UnitySimulator] Result file created after {elapsed:.1f}s")
+                    self._log(f"[UnitySimulator] Result file created after {elapsed:.1f}s")
                     return
                 else:
-                    print(f"[UnitySimulator] Result file exists but still being written...")
+                    self._log(f"[UnitySimulator] Result file exists but still being written...")
 
             # Check if Unity process crashed (subprocess mode only)
             if process is not None and process.poll() is not None:
@@ -362,10 +437,14 @@ class UnitySimulator:
 
             # Print progress
             if int(elapsed) % 30 == 0 and int(elapsed) > 0:
-                print(f"[UnitySimulator] Still waiting... ({elapsed:.0f}s elapsed)")
+                self._log(f"[UnitySimulator] Still waiting... ({elapsed:.0f}s elapsed)")
 
-            # Wait before next check
-            time.sleep(check_interval)
+            # Wait before next check (wakes early when the watcher sees the result file change)
+            if result_event is not None:
+                result_event.wait(check_interval)
+                result_event.clear()
+            else:
+                self._stop_event.wait(check_interval)
 
     def _is_file_stable(self, file_path: Path, stability_checks: int = 2, check_interval: float = 0.5) -> bool:
         """
@@ -410,6 +489,27 @@ class UnitySimulator:
             print(f"[UnitySimulator] WARNING: Cannot check file stability: {e}")
             return False
 
+    def stop(self):
+        """
+        Abort the running simulation (safe to call from another thread).
+
+        Kills the Unity subprocess (subprocess mode) or withdraws a trigger file
+        Unity has not picked up yet (file trigger mode). The waiting
+        run_simulation() call raises RuntimeError within one poll interval.
+        """
+        self._stop_event.set()
+
+        process = self._process
+        if process is not None and process.poll() is None:
+            self._log(f"[UnitySimulator] Killing Unity process (PID: {process.pid})...")
+            process.kill()
+
+        if self.use_file_trigger:
+            try:
+                self.trigger_file.unlink()
+            except OSError:
+                pass  # Already consumed by Unity (or never created)
+
     def cleanup(self):
         """
         Cleanup resources (if needed).
@@ -1,10 +1,18 @@
 import json
 import argparse
+import mmap
+import os
 import numpy as np
 from pathlib import Path
 from typing import Dict, List, Any, Tuple
 from datetime import datetime
 
+# Optional: orjson parses large Unity result files several times faster (falls back to stdlib json)
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 DEFAULT_UNITY_OUTPUT = r"D:\UnityProjects\META_VERYOLD_P01_s\Assets\StreamingAssets\Calibration\Output\simulation_result.json"
 
 # Objective function weights (must sum to 1.0)
@@ -16,14 +24,23 @@ WEIGHTS = {
 }
 
 def load_simulation_result(filepath: str) -> Dict[str, Any]:
-    """Load simulation result JSON file."""
+    """Load simulation result JSON file (multi-MB per-agent trajectory errors)."""
     path = Path(filepath)
 
     if not path.exists():
         raise FileNotFoundError(f"File not found: {filepath}")
 
-    with open(path, 'r') as f:
-        data = json.load(f)
+    if orjson is not None:
+        # Parse straight from the memory-mapped file (no read copy into a bytes object)
+        with open(path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                data = orjson.loads(b'')  # mmap cannot map an empty file; raises the usual decode error
+            else:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+                    data = orjson.loads(view)
+    else:
+        with open(path, 'r') as f:
+            data = json.load(f)
 
     return data
 
@@ -40,6 +57,16 @@ def compute_percentile_95(agent_errors: List[Dict[str, Any]]) -> float:
 
     return percentile_95
 
+def _error_growth_slope(error_values: np.ndarray) -> float:
+    """
+    Least-squares slope of error vs. time index (same as scipy.stats.linregress slope).
+
+    Closed form: slope = sum((t - t_mean) * (e - e_mean)) / sum((t - t_mean)^2)
+    """
+    t = np.arange(len(error_values), dtype=np.float64)
+    t -= t.mean()
+    return float(np.dot(t, error_values - error_values.mean()) / np.dot(t, t))
+
 def compute_time_growth_penalty(agent_errors: List[Dict[str, Any]]) -> float:
     """
     Compute average error growth rate using linear regression.
@@ -55,8 +82,6 @@ def compute_time_growth_penalty(agent_errors: List[Dict[str, Any]]) -> float:
     if not agent_errors:
         return 0.0
 
-    from scipy.stats import linregress
-
     growth_slopes = []
 
     for agent in agent_errors:
@@ -65,12 +90,11 @@ def compute_time_growth_penalty(agent_errors: List[Dict[str, Any]]) -> float:
         if len(errors) < 4:  # Need at least 4 points for meaningful regression
             continue
 
-        # Extract error values and time indices
-        error_values = [e['error'] for e in errors]
-        time_indices = list(range(len(error_values)))
+        # Extract error values (time index = position in trajectory)
+        error_values = np.fromiter((e['error'] for e in errors), dtype=np.float64, count=len(errors))
 
         # Linear regression: error = slope × time + intercept
-        slope, intercept, r_value, p_value, std_err = linregress(time_indices, error_values)
+        slope = _error_growth_slope(error_values)
 
         # Only penalize positive slopes (growing error)
         # Negative slopes indicate improving accuracy over time (good!)
@@ -161,8 +185,9 @@ def evaluate_objective(simulation_result: Dict[str, Any]) -> Tuple[float, Dict[s
     # RMSE is more sensitive to large errors than MAE (literature standard)
     agent_errors = simulation_result['agentErrors']
     if agent_errors:
-        agent_mean_errors = [agent['meanError'] for agent in agent_errors]
-        mean_error = np.sqrt(np.mean([err ** 2 for err in agent_mean_errors]))
+        agent_mean_errors = np.fromiter((agent['meanError'] for agent in agent_errors),
+                                        dtype=np.float64, count=len(agent_errors))
+        mean_error = np.sqrt(np.mean(agent_mean_errors ** 2))
     else:
         mean_error = 0.0
 
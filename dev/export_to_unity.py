@@ -5,6 +5,12 @@ from typing import Dict, Any
 from datetime import datetime
 import uuid
 
+# Optional: orjson serializes the parameter file faster (falls back to stdlib json)
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 DEFAULT_UNITY_INPUT = r"D:\UnityProjects\META_VERYOLD_P01_s\Assets\StreamingAssets\Calibration\Input"
 
 PARAMETER_BOUNDS = {
@@ -152,9 +158,13 @@ def export_to_unity_json(
     output_path = Path(output_path)
     output_path.parent.mkdir(parents=True, exist_ok=True)
 
-    # Write JSON file
-    with open(output_path, 'w') as f:
-        json.dump(unity_json, f, indent=2)
+    # Write JSON file (same 2-space indented layout with either serializer)
+    if orjson is not None:
+        with open(output_path, 'wb') as f:
+            f.write(orjson.dumps(unity_json, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY))
+    else:
+        with open(output_path, 'w') as f:
+            json.dump(unity_json, f, indent=2)
 
     return experiment_id
 
@@ -1,7 +1,24 @@
+import os
 import json
+import sys
+import mmap
 import argparse
+from dataclasses import dataclass
 from pathlib import Path
 from typing import Dict, List, Any
+import numpy as np
+
+# Optional: orjson parses large result files several times faster (falls back to stdlib json)
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Optional: ijson streams agentErrors for --stream (constant memory per trajectory point)
+try:
+    import ijson
+except ImportError:
+    ijson = None
 
 DEFAULT_UNITY_OUTPUT = r"D:\UnityProjects\META_VERYOLD_P01_s\Assets\StreamingAssets\Calibration\Output\simulation_result.json"
 
@@ -26,6 +43,16 @@ PARAMETER_NAMES = [
     "visibleFactor"
 ]
 
+# Display grouping for print_parameters (section title, parameter names)
+PARAMETER_SECTIONS = [
+    ("Basic Physics", ["minimalDistance", "relaxationTime"]),
+    ("Agent Interaction", ["repulsionStrengthAgent", "repulsionRangeAgent", "lambdaAgent"]),
+    ("Obstacle Interaction", ["repulsionStrengthObs", "repulsionRangeObs", "lambdaObs"]),
+    ("Physical Contact Forces", ["k", "kappa", "obsK", "obsKappa"]),
+    ("Perception/Vision", ["considerationRange", "viewAngle", "viewAngleMax", "viewDistance",
+                           "rayStepAngle", "visibleFactor"]),
+]
+
 def load_simulation_result(filepath: str) -> Dict[str, Any]:
     """Load simulation result JSON file."""
     path = Path(filepath)
@@ -34,14 +61,231 @@ def load_simulation_result(filepath: str) -> Dict[str, Any]:
         raise FileNotFoundError(f"File not found: {filepath}")
 
     print(f"Loading: {filepath}")
-    print(f"File size: {path.stat().st_size / 1024 / 1024:.2f} MB")
 
-    with open(path, 'r') as f:
-        data = json.load(f)
+    # One open: size from the open descriptor, content parsed from a read-only mapping
+    # (orjson.JSONDecodeError subclasses json.JSONDecodeError, handled the same in main)
+    with open(path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        print(f"File size: {size / 1024 / 1024:.2f} MB")
+
+        if orjson is not None and size > 0:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                view = memoryview(mm)
+                try:
+                    data = orjson.loads(view)
+                finally:
+                    view.release()
+        else:
+            data = json.load(f)
 
     print(f"JSON loaded successfully\n")
     return data
 
+def load_simulation_summary(filepath: str) -> Dict[str, Any]:
+    """
+    Stream simulation result JSON, keeping only per-agent scalars (requires ijson).
+
+    Same structure as load_simulation_result(), except each agentErrors entry
+    has no 'errors' list; its length is stored as 'errorCount' instead.
+    Trajectory points are counted while parsing and never materialized.
+    """
+    path = Path(filepath)
+
+    if not path.exists():
+        raise FileNotFoundError(f"File not found: {filepath}")
+
+    print(f"Loading (streaming): {filepath}")
+    print(f"File size: {path.stat().st_size / 1024 / 1024:.2f} MB")
+
+    root = ijson.ObjectBuilder()
+    agents = []
+    agent = None
+    n_errors = 0
+
+    with open(path, 'rb') as f:
+        for prefix, event, value in ijson.parse(f, use_float=True):
+            if prefix == 'agentErrors.item.errors' or prefix.startswith('agentErrors.item.errors.'):
+                # Trajectory points: only count them
+                if prefix == 'agentErrors.item.errors.item' and event == 'start_map':
+                    n_errors += 1
+            elif prefix == 'agentErrors.item' or prefix.startswith('agentErrors.item.'):
+                # Per-agent scalars
+                if prefix == 'agentErrors.item' and event == 'start_map':
+                    agent = ijson.ObjectBuilder()
+                    n_errors = 0
+                if not (prefix == 'agentErrors.item' and event == 'map_key' and value == 'errors'):
+                    agent.event(event, value)
+                if prefix == 'agentErrors.item' and event == 'end_map':
+                    summary = agent.value
+                    summary['errorCount'] = n_errors
+                    agents.append(summary)
+            elif prefix == 'agentErrors' or (prefix == '' and event == 'map_key' and value == 'agentErrors'):
+                continue
+            else:
+                root.event(event, value)
+
+    data = root.value
+    data['agentErrors'] = agents
+
+    print(f"JSON streamed successfully\n")
+    return data
+
+# Top-level fields read by --summary-only (everything print_summary/print_parameters need)
+SUMMARY_KEYS = frozenset([
+    'experimentId', 'executionTimeSeconds', 'totalAgents', 'completedAgents',
+    'averageError', 'maxError', 'parameters',
+])
+
+def load_simulation_summary_only(filepath: str) -> Dict[str, Any]:
+    """
+    Stream only the SUMMARY_KEYS fields of a result JSON (requires ijson).
+
+    agentErrors is tokenized but never built; parsing stops as soon as all
+    summary fields have been read. Returned dict has an empty agentErrors list.
+    """
+    path = Path(filepath)
+
+    if not path.exists():
+        raise FileNotFoundError(f"File not found: {filepath}")
+
+    print(f"Loading (summary only): {filepath}")
+    print(f"File size: {path.stat().st_size / 1024 / 1024:.2f} MB")
+
+    data = {}
+    key = None
+    builder = None
+
+    with open(path, 'rb') as f:
+        for prefix, event, value in ijson.parse(f, use_float=True):
+            if prefix == '':
+                # Top-level object: pick the fields to build
+                if event == 'map_key':
+                    key = value
+                    builder = ijson.ObjectBuilder() if value in SUMMARY_KEYS else None
+                continue
+            if builder is None:
+                continue
+
+            builder.event(event, value)
+            # Value complete: a scalar at the key itself, or the end of its map/array
+            if prefix == key and event not in ('start_map', 'start_array', 'map_key'):
+                data[key] = builder.value
+                builder = None
+                if len(data) == len(SUMMARY_KEYS):
+                    break
+
+    data['agentErrors'] = []
+
+    print(f"JSON streamed successfully\n")
+    return data
+
+def find_agent_errors(filepath: str, agent_id: int) -> List[Dict[str, Any]]:
+    """
+    Stream agentErrors and return the matching agent's full entry (requires ijson).
+
+    Returns:
+        [agent entry] if found, else []
+    """
+    with open(filepath, 'rb') as f:
+        for agent in ijson.items(f, 'agentErrors.item', use_float=True):
+            if agent.get('agentId') == agent_id:
+                return [agent]
+    return []
+
+@dataclass
+class AgentErrorTable:
+    """
+    Struct-of-arrays view of agentErrors (index i = i-th agent in file order).
+
+    Attributes:
+        ids: Agent IDs, int64 (-1 if missing)
+        traj_len: Trajectory lengths, int64
+        mean_err: Mean errors, float64
+        max_err: Max errors, float64
+        point_count: Number of trajectory points per agent, int64
+        points: agentId -> (T, 6) float32 matrix with columns
+                (timeIndex, error, empirical x, empirical z, validation x, validation z);
+                timeIndex is NaN where missing. Empty for streamed summaries.
+    """
+    ids: np.ndarray
+    traj_len: np.ndarray
+    mean_err: np.ndarray
+    max_err: np.ndarray
+    point_count: np.ndarray
+    points: Dict[int, np.ndarray]
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+def build_agent_table(agent_errors: List[Dict[str, Any]]) -> AgentErrorTable:
+    """
+    Convert the agentErrors list of dicts into an AgentErrorTable.
+
+    Trajectory points of each agent become one contiguous matrix, so the
+    per-point dicts can be released after conversion.
+    """
+    n_agents = len(agent_errors)
+
+    def column(key, default, dtype):
+        return np.fromiter((agent.get(key, default) for agent in agent_errors), dtype=dtype, count=n_agents)
+
+    # Trajectory matrices and point counts in one pass (streamed summaries carry errorCount instead)
+    points = {}
+    point_count = np.empty(n_agents, dtype=np.int64)
+    for i, agent in enumerate(agent_errors):
+        errors = agent.get('errors')
+        if errors is None:
+            point_count[i] = agent.get('errorCount', 0)
+            continue
+        point_count[i] = len(errors)
+        agent_id = agent.get('agentId', -1)
+        if errors and agent_id not in points:  # First entry wins for duplicate IDs
+            points[agent_id] = _trajectory_matrix(errors)
+
+    return AgentErrorTable(
+        ids=column('agentId', -1, np.int64),
+        traj_len=column('trajectoryLength', 0, np.int64),
+        mean_err=column('meanError', 0, np.float64),
+        max_err=column('maxError', 0, np.float64),
+        point_count=point_count,
+        points=points
+    )
+
+# float32 holds every integer up to 2**24 exactly (timeIndex column)
+FLOAT32_EXACT_INT_LIMIT = 2 ** 24
+
+# Shared default for missing empiricalPos/validationPos (never modified)
+_NO_POSITION: Dict[str, float] = {}
+
+def _trajectory_matrix(errors: List[Dict[str, Any]]) -> np.ndarray:
+    """
+    Pack trajectory point dicts into a (T, 6) matrix (see AgentErrorTable.points).
+
+    Errors and positions are metre-scale with ~mm precision, so the matrix is
+    stored as float32 (half the memory of float64). Trajectories with time
+    indices beyond FLOAT32_EXACT_INT_LIMIT stay float64.
+    """
+    matrix = np.fromiter(_trajectory_values(errors), dtype=np.float64, count=6 * len(errors)).reshape(-1, 6)
+
+    if np.nanmax(np.abs(matrix[:, 0]), initial=0) > FLOAT32_EXACT_INT_LIMIT:
+        return matrix
+    return matrix.astype(np.float32)
+
+def _trajectory_values(errors: List[Dict[str, Any]]):
+    """Yield the 6 matrix values of each trajectory point, row by row (flat)."""
+    nan = float('nan')
+    for point in errors:
+        # Bound once per point instead of resolving .get for every field
+        emp_get = point.get('empiricalPos', _NO_POSITION).get
+        val_get = point.get('validationPos', _NO_POSITION).get
+        time_idx = point.get('timeIndex')
+        yield nan if time_idx is None else time_idx
+        yield point.get('error', 0)
+        yield emp_get('x', 0)
+        yield emp_get('z', 0)
+        yield val_get('x', 0)
+        yield val_get('z', 0)
+
 def print_summary(data: Dict[str, Any]) -> None:
     """Print simulation summary information."""
     print("=" * 80)
@@ -69,112 +313,115 @@ def print_parameters(params: Dict[str, float]) -> None:
     if missing_params:
         print(f"WARNING: Missing parameters: {missing_params}")
 
-    print("\nBasic Physics:")
-    print(f"  minimalDistance:        {params.get('minimalDistance', 'N/A'):.4f}")
-    print(f"  relaxationTime:         {params.get('relaxationTime', 'N/A'):.4f}")
-
-    print("\nAgent Interaction:")
-    print(f"  repulsionStrengthAgent: {params.get('repulsionStrengthAgent', 'N/A'):.4f}")
-    print(f"  repulsionRangeAgent:    {params.get('repulsionRangeAgent', 'N/A'):.4f}")
-    print(f"  lambdaAgent:            {params.get('lambdaAgent', 'N/A'):.4f}")
-
-    print("\nObstacle Interaction:")
-    print(f"  repulsionStrengthObs:   {params.get('repulsionStrengthObs', 'N/A'):.4f}")
-    print(f"  repulsionRangeObs:      {params.get('repulsionRangeObs', 'N/A'):.4f}")
-    print(f"  lambdaObs:              {params.get('lambdaObs', 'N/A'):.4f}")
-
-    print("\nPhysical Contact Forces:")
-    print(f"  k:                      {params.get('k', 'N/A'):.4f}")
-    print(f"  kappa:                  {params.get('kappa', 'N/A'):.4f}")
-    print(f"  obsK:                   {params.get('obsK', 'N/A'):.4f}")
-    print(f"  obsKappa:               {params.get('obsKappa', 'N/A'):.4f}")
-
-    print("\nPerception/Vision:")
-    print(f"  considerationRange:     {params.get('considerationRange', 'N/A'):.4f}")
-    print(f"  viewAngle:              {params.get('viewAngle', 'N/A'):.4f}")
-    print(f"  viewAngleMax:           {params.get('viewAngleMax', 'N/A'):.4f}")
-    print(f"  viewDistance:           {params.get('viewDistance', 'N/A'):.4f}")
-    print(f"  rayStepAngle:           {params.get('rayStepAngle', 'N/A'):.4f}")
-    print(f"  visibleFactor:          {params.get('visibleFactor', 'N/A'):.4f}")
+    for section, names in PARAMETER_SECTIONS:
+        print(f"\n{section}:")
+        for name in names:
+            value = params.get(name)
+            value_str = f"{value:.4f}" if isinstance(value, (int, float)) else "N/A"
+            print(f"  {name + ':':<24}{value_str}")
     print()
 
-def print_error_statistics(agent_errors: List[Dict[str, Any]], verbose: bool = False) -> None:
+def top_k_indices(values: np.ndarray, k: int) -> np.ndarray:
+    """
+    Indices of the k largest values in descending order.
+
+    Ties keep input order, same as sorted(..., reverse=True). Only values
+    >= the k-th largest (found with np.partition) are sorted.
+    """
+    if len(values) > k:
+        kth_largest = np.partition(values, len(values) - k)[len(values) - k]
+        candidates = np.flatnonzero(values >= kth_largest)
+    else:
+        candidates = np.arange(len(values))
+
+    order = np.argsort(-values[candidates], kind='stable')
+    return candidates[order[:k]]
+
+def print_error_statistics(table: AgentErrorTable, verbose: bool = False) -> None:
     """Print agent error statistics."""
     print("=" * 80)
     print("AGENT ERROR STATISTICS")
     print("=" * 80)
 
-    if not agent_errors:
+    if not len(table):
         print("WARNING: No agent error data found!")
         return
 
-    print(f"Total Agents with Error Data: {len(agent_errors)}")
+    print(f"Total Agents with Error Data: {len(table)}")
 
-    total_trajectory_points = sum(len(agent.get('errors', [])) for agent in agent_errors)
+    total_trajectory_points = int(table.point_count.sum())
     print(f"Total Trajectory Points:       {total_trajectory_points}")
 
-    avg_trajectory_length = sum(agent.get('trajectoryLength', 0) for agent in agent_errors) / len(agent_errors)
+    avg_trajectory_length = table.traj_len.mean()
     print(f"Average Trajectory Length:     {avg_trajectory_length:.2f} timesteps")
 
-    sorted_agents = sorted(agent_errors, key=lambda x: x.get('meanError', 0), reverse=True)
+    # Full ranking only when all agents are listed; otherwise select the top 10 without sorting everything
+    if verbose:
+        ranking = np.argsort(-table.mean_err, kind='stable')
+        top10 = ranking[:10]
+    else:
+        top10 = top_k_indices(table.mean_err, 10)
 
     print(f"\nTop 10 Agents by Mean Error:")
     print(f"{'Agent ID':<12} {'Traj Length':<15} {'Mean Error':<15} {'Max Error':<15}")
     print("-" * 60)
-    for agent in sorted_agents[:10]:
-        agent_id = agent.get('agentId', 'N/A')
-        traj_len = agent.get('trajectoryLength', 0)
-        mean_err = agent.get('meanError', 0)
-        max_err = agent.get('maxError', 0)
-        print(f"{agent_id:<12} {traj_len:<15} {mean_err:<15.4f} {max_err:<15.4f}")
+    for i in top10:
+        print(_format_agent_row(table, i))
 
     if verbose:
         print(f"\nAll Agents Error Summary:")
         print(f"{'Agent ID':<12} {'Traj Length':<15} {'Mean Error':<15} {'Max Error':<15}")
         print("-" * 60)
-        for agent in sorted_agents:
-            agent_id = agent.get('agentId', 'N/A')
-            traj_len = agent.get('trajectoryLength', 0)
-            mean_err = agent.get('meanError', 0)
-            max_err = agent.get('maxError', 0)
-            print(f"{agent_id:<12} {traj_len:<15} {mean_err:<15.4f} {max_err:<15.4f}")
+        for i in ranking:
+            print(_format_agent_row(table, i))
     print()
 
-def print_agent_detail(agent_errors: List[Dict[str, Any]], agent_id: int) -> None:
+
+def _format_agent_row(table: AgentErrorTable, i: int) -> str:
+    """Format agent i as a row of the error summary tables."""
+    agent_id = table.ids[i] if table.ids[i] >= 0 else 'N/A'
+    return f"{agent_id:<12} {table.traj_len[i]:<15} {table.mean_err[i]:<15.4f} {table.max_err[i]:<15.4f}"
+
+def print_agent_detail(table: AgentErrorTable, agent_id: int) -> None:
     """Print detailed trajectory for specific agent."""
-    agent_data = next((agent for agent in agent_errors if agent.get('agentId') == agent_id), None)
+    matches = np.flatnonzero(table.ids == agent_id)
 
-    if not agent_data:
+    if not len(matches):
         print(f"ERROR: Agent {agent_id} not found in data!")
         return
+    i = matches[0]
 
     print("=" * 80)
     print(f"AGENT {agent_id} DETAILED TRAJECTORY")
     print("=" * 80)
-    print(f"Trajectory Length:  {agent_data.get('trajectoryLength', 0)} timesteps")
-    print(f"Mean Error:         {agent_data.get('meanError', 0):.4f} m")
-    print(f"Max Error:          {agent_data.get('maxError', 0):.4f} m")
+    print(f"Trajectory Length:  {table.traj_len[i]} timesteps")
+    print(f"Mean Error:         {table.mean_err[i]:.4f} m")
+    print(f"Max Error:          {table.max_err[i]:.4f} m")
     print()
 
-    errors = agent_data.get('errors', [])
-    if not errors:
+    points = table.points.get(agent_id)
+    if points is None:
         print("No trajectory data available")
         return
 
     print(f"{'TimeIdx':<10} {'Error (m)':<12} {'Empirical Pos':<30} {'Validation Pos':<30}")
     print("-" * 85)
 
-    for error_point in errors:
-        time_idx = error_point.get('timeIndex', 'N/A')
-        error = error_point.get('error', 0)
-        emp_pos = error_point.get('empiricalPos', {})
-        val_pos = error_point.get('validationPos', {})
+    # Build all rows first and write them at once (trajectories can be 10k+ timesteps)
+    lines = [_format_trajectory_row(row) for row in points.tolist()]
+    lines.append('\n')
+    sys.stdout.write('\n'.join(lines))
 
-        emp_str = f"({emp_pos.get('x', 0):.2f}, {emp_pos.get('z', 0):.2f})"
-        val_str = f"({val_pos.get('x', 0):.2f}, {val_pos.get('z', 0):.2f})"
 
-        print(f"{time_idx:<10} {error:<12.4f} {emp_str:<30} {val_str:<30}")
-    print()
+def _format_trajectory_row(row: List[float]) -> str:
+    """Format one trajectory point (a row of AgentErrorTable.points) for the agent detail table."""
+    time_idx, error, emp_x, emp_z, val_x, val_z = row
+    time_idx = 'N/A' if time_idx != time_idx else int(time_idx)  # NaN = missing
+
+    emp_str = f"({emp_x:.2f}, {emp_z:.2f})"
+    val_str = f"({val_x:.2f}, {val_z:.2f})"
+
+    return f"{time_idx:<10} {error:<12.4f} {emp_str:<30} {val_str:<30}"
 
 def main():
     parser = argparse.ArgumentParser(
@@ -186,6 +433,8 @@ Examples:
   python dev/load_simulation_results.py --file path/to/result.json
   python dev/load_simulation_results.py --verbose
   python dev/load_simulation_results.py --agent-id 42
+  python dev/load_simulation_results.py --stream          # Very large files (requires ijson)
+  python dev/load_simulation_results.py --summary-only    # Summary and parameters only (requires ijson)
         """
     )
 
@@ -208,28 +457,62 @@ Examples:
         help='Show detailed trajectory for specific agent ID'
     )
 
+    parser.add_argument(
+        '--stream',
+        action='store_true',
+        help='Stream agentErrors without loading trajectory points into memory (requires ijson)'
+    )
+
+    parser.add_argument(
+        '--summary-only',
+        action='store_true',
+        help='Only read summary fields and parameters, skip agentErrors entirely (requires ijson)'
+    )
+
     args = parser.parse_args()
 
+    if (args.stream or args.summary_only) and ijson is None:
+        print(f"ERROR: {'--stream' if args.stream else '--summary-only'} requires ijson (pip install ijson)")
+        return 1
+    if args.summary_only and (args.verbose or args.agent_id is not None):
+        print("ERROR: --summary-only cannot be combined with --verbose or --agent-id")
+        return 1
+
     try:
-        data = load_simulation_result(args.file)
+        if args.summary_only:
+            data = load_simulation_summary_only(args.file)
+        elif args.stream:
+            data = load_simulation_summary(args.file)
+        else:
+            data = load_simulation_result(args.file)
 
         print_summary(data)
 
         params = data.get('parameters', {})
         print_parameters(params)
 
-        agent_errors = data.get('agentErrors', [])
-        print_error_statistics(agent_errors, verbose=args.verbose)
+        if args.summary_only:
+            print(f"[OK] {len(params)}/18 parameters found (agentErrors skipped)")
+            print()
+            return 0
+
+        # Column arrays replace the per-agent dicts (released after conversion)
+        agent_table = build_agent_table(data.pop('agentErrors', []))
+        print_error_statistics(agent_table, verbose=args.verbose)
 
         if args.agent_id is not None:
-            print_agent_detail(agent_errors, args.agent_id)
+            if args.stream:
+                # Summary entries carry no trajectory: targeted second pass for this agent
+                print_agent_detail(build_agent_table(find_agent_errors(args.file, args.agent_id)), args.agent_id)
+            else:
+                print_agent_detail(agent_table, args.agent_id)
 
         print("=" * 80)
         print("VALIDATION COMPLETE")
         print("=" * 80)
         print(f"[OK] JSON file loaded successfully")
         print(f"[OK] {len(params)}/18 parameters found")
-        print(f"[OK] {len(agent_errors)} agents with error data")
+        print(f"[OK] {len(agent_table)} agents with error data")
         print(f"[OK] Data structure validated")
         print()
 
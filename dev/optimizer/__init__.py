@@ -4,6 +4,7 @@ Optimization algorithm implementations.
 This package contains:
 - base_optimizer: Abstract base class for all optimizers
 - scipy_de_optimizer: Scipy Differential Evolution implementation
+- numpy_de_optimizer: NumPy Differential Evolution implementation (self-contained DE core)
 
 Future additions:
 - bayesian_optimizer: Bayesian Optimization (scikit-optimize)
@@ -11,4 +12,4 @@ Future additions:
 - pso_optimizer: Particle Swarm Optimization (pyswarms)
 """
 
-__all__ = ['base_optimizer', 'scipy_de_optimizer']
+__all__ = ['base_optimizer', 'scipy_de_optimizer', 'numpy_de_optimizer']
@@ -7,9 +7,12 @@ with the calibration system.
 
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
+from datetime import datetime
 from typing import Callable, List, Tuple, Optional
 import numpy as np
 
+from core.checkpoint import save_checkpoint
+
 
 @dataclass
 class OptimizerResult:
@@ -81,6 +84,11 @@ class BaseOptimizer(ABC):
         self.n_params = len(bounds)
         self.eval_count = 0
 
+        # Bounds as arrays for vectorized checks
+        bounds_array = np.asarray(bounds, dtype=np.float64)
+        self._lo = bounds_array[:, 0]
+        self._hi = bounds_array[:, 1]
+
     @abstractmethod
     def optimize(self) -> OptimizerResult:
         """
@@ -111,11 +119,75 @@ class BaseOptimizer(ABC):
         Returns:
             True if all parameters within bounds
         """
-        if len(params) != self.n_params:
-            return False
+        params = np.asarray(params)
+        return params.shape == (self.n_params,) and bool(np.all((params >= self._lo) & (params <= self._hi)))
+
+    def _save_checkpoint(self, eval_counter: int, best_params: np.ndarray, best_objective: float, generation: int = 0,
+                         end_of_generation: bool = True):
+        """
+        Save checkpoint after every evaluation.
+
+        Args:
+            eval_counter: Current evaluation number
+            best_params: Best parameters found so far
+            best_objective: Best objective value found so far
+            generation: Current generation number
+            end_of_generation: Last checkpoint of the generation (or batch): the history
+                               CSV is flushed first. Checkpoints within a generation
+                               leave rows buffered (see --history-flush-every)
+        """
+        if best_params is None:
+            return  # Skip if no best solution yet
+
+        # Get history CSV path from objective function
+        history_csv_path = None
+        if hasattr(self.objective_function, 'history') and self.objective_function.history:
+            history = self.objective_function.history
+            history_csv_path = str(history.output_path)
+            # Rows of a finished generation must be on disk before its checkpoint is written
+            if end_of_generation and hasattr(history, 'flush'):
+                history.flush()
+
+        checkpoint = {
+            'eval_counter': eval_counter,
+            'generation': generation,
+            'best_params': best_params,
+            'best_objective': best_objective,
+            'random_state': np.random.get_state(),
+            'history_csv': history_csv_path,
+            'algorithm': self.get_algorithm_name(),
+            'popsize': getattr(self, 'popsize', None),
+            'seed': self.seed,
+            'max_evaluations': self.max_evaluations,
+            'timestamp': datetime.now().isoformat()
+        }
 
-        for i, (low, high) in enumerate(self.bounds):
-            if not (low <= params[i] <= high):
-                return False
+        save_checkpoint(checkpoint)
 
-        return True
+    def _checkpoint_failed_batch(self, eval_counter: int, best_params: Optional[np.ndarray],
+                                 best_objective: float, generation: int) -> Tuple[Optional[np.ndarray], float]:
+        """
+        Save a checkpoint after evaluate_batch() raised (failed simulation or Ctrl+C).
+
+        The objective function has already recorded the simulations of the batch
+        that finished, so they count towards the best solution and the
+        checkpoint. eval_counter covers the whole batch, so a resumed run does
+        not reuse (and overwrite) its evaluation numbers.
+
+        Args:
+            eval_counter: Evaluation number after the whole batch
+            best_params: Best parameters before the batch
+            best_objective: Best objective value before the batch
+            generation: Current generation number
+
+        Returns:
+            (best_params, best_objective) including the finished simulations
+        """
+        get_best = getattr(self.objective_function, 'get_best_evaluation', None)
+        best = get_best() if get_best is not None else None
+        if best is not None and best['objective'] < best_objective:
+            best_params = best['params'].copy()
+            best_objective = best['objective']
+
+        self._save_checkpoint(eval_counter, best_params, best_objective, generation)
+        return best_params, best_objective
@@ -0,0 +1,373 @@
+"""
+NumPy Differential Evolution optimizer implementation.
+
+Self-contained DE core (mutation, crossover, selection as whole-population
+NumPy operations) conforming to BaseOptimizer interface.
+"""
+
+import numpy as np
+from typing import Callable, List, Tuple, Optional, Union
+
+from optimizer.base_optimizer import BaseOptimizer, OptimizerResult
+
+
+def _best1(best: np.ndarray, r: List[np.ndarray], f: float) -> np.ndarray:
+    return best + f * (r[0] - r[1])
+
+
+def _best2(best: np.ndarray, r: List[np.ndarray], f: float) -> np.ndarray:
+    return best + f * (r[0] - r[1] + r[2] - r[3])
+
+
+def _rand1(best: np.ndarray, r: List[np.ndarray], f: float) -> np.ndarray:
+    return r[0] + f * (r[1] - r[2])
+
+
+def _rand2(best: np.ndarray, r: List[np.ndarray], f: float) -> np.ndarray:
+    return r[0] + f * (r[1] - r[2] + r[3] - r[4])
+
+
+# Strategy -> (random population members drawn, excluding the target; mutant builder)
+STRATEGIES = {
+    'best1bin': (2, _best1),
+    'best2bin': (4, _best2),
+    'rand1bin': (3, _rand1),
+    'rand2bin': (5, _rand2),
+}
+
+
+class NumpyDEOptimizer(BaseOptimizer):
+    """
+    NumPy Differential Evolution optimizer.
+
+    Same algorithm family as ScipyDEOptimizer, but the generation loop is
+    implemented directly so that:
+    - Each generation's trial population is built with a few array operations
+    - Evaluation stops at exactly max_evaluations (no penalty values injected)
+    - No scipy callback/convergence machinery between evaluations
+
+    This is the low-overhead choice for cheap objectives (tests, surrogate
+    models): mutation, crossover, bound repair and selection for the whole
+    population are a handful of NumPy calls per generation, so there is no
+    per-individual Python loop left to compile.
+
+    Population layout and generation numbering match ScipyDEOptimizer:
+    - Population = popsize × n_params individuals (popsize is a MULTIPLIER)
+    - Generation 1 = initial random population, generation g+1 = g-th evolution step
+
+    References:
+        - Storn & Price (1997): "Differential Evolution - A Simple and Efficient
+          Heuristic for Global Optimization over Continuous Spaces"
+
+    Example:
+        optimizer = NumpyDEOptimizer(
+            bounds=[(0.15, 0.35), (0.3, 0.8), ...],  # 18 parameter bounds
+            objective_function=obj_func,
+            max_evaluations=720,
+            popsize=4,            # 4×18 = 72 individuals/generation
+            generations=10,
+            seed=42
+        )
+        result = optimizer.optimize()
+    """
+
+    def __init__(
+        self,
+        bounds: List[Tuple[float, float]],
+        objective_function: Callable[[np.ndarray], float],
+        max_evaluations: int,
+        seed: Optional[int] = None,
+        popsize: int = 10,
+        generations: Optional[int] = None,
+        strategy: str = 'best1bin',
+        mutation: Union[float, Tuple[float, float]] = (0.5, 1.0),
+        recombination: float = 0.7,
+        resume_eval_counter: int = 0,
+        resume_generation: int = 0
+    ):
+        """
+        Initialize NumPy DE optimizer.
+
+        Args:
+            bounds: Parameter bounds [(min, max), ...]
+            objective_function: Function to minimize, signature: params -> objective
+            max_evaluations: Total evaluation budget (including evaluations before resume)
+            seed: Random seed for reproducibility (None = random seed)
+            popsize: Population multiplier (actual_pop = popsize × n_params, default: 10)
+            generations: Number of generations (default: None = auto-calculate from max_evaluations)
+            strategy: DE mutation strategy ('best1bin', 'best2bin', 'rand1bin', 'rand2bin')
+            mutation: Mutation factor F, or (min, max) range for per-generation dithering
+            recombination: Crossover probability [0, 1]
+            resume_eval_counter: Resume from this evaluation count (default: 0)
+            resume_generation: Resume from this generation number (default: 0)
+        """
+        super().__init__(bounds, objective_function, max_evaluations, seed)
+
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Unknown strategy: {strategy} (choices: {list(STRATEGIES)})")
+
+        self.popsize = popsize
+        self.strategy = strategy
+        self._n_picks, self._build_mutants = STRATEGIES[strategy]  # Resolved once, not per generation
+        self.mutation = mutation
+        self.recombination = recombination
+        self.resume_eval_counter = resume_eval_counter
+        self.resume_generation = resume_generation
+
+        # Generate random seed if not provided (for reproducibility)
+        if seed is None:
+            import random
+            self.seed = random.randint(0, 2**31 - 1)
+            self.seed_was_random = True
+        else:
+            self.seed_was_random = False
+
+        n_params = len(bounds)
+        self.population_size = popsize * n_params
+        if generations is not None:
+            self.generations = generations
+        else:
+            self.generations = max_evaluations // self.population_size
+
+        self._bmin = self._lo
+        self._brange = self._hi - self._lo
+
+    def optimize(self) -> OptimizerResult:
+        """
+        Run NumPy Differential Evolution optimization.
+
+        Stops when the evaluation budget or the generation limit is reached,
+        whichever comes first. A partially evaluated last generation only
+        replaces the individuals whose trials were actually evaluated.
+
+        Returns:
+            OptimizerResult with best parameters and metadata
+        """
+        print("=" * 80)
+        print("NUMPY DIFFERENTIAL EVOLUTION OPTIMIZATION")
+        print("=" * 80)
+        print(f"Algorithm:       {self.get_algorithm_name()}")
+        print(f"Parameters:      {self.n_params}")
+        print(f"Population:      {self.popsize} (×{self.n_params} = {self.population_size} individuals)")
+        print(f"Max Generations: {self.generations}")
+        print(f"Max Evaluations: {self.max_evaluations}")
+        print(f"Strategy:        {self.strategy}")
+        print(f"Mutation:        {self.mutation}")
+        print(f"Recombination:   {self.recombination}")
+        if self.seed_was_random:
+            print(f"Random Seed:     {self.seed} (auto-generated, use --seed {self.seed} to reproduce)")
+        else:
+            print(f"Random Seed:     {self.seed} (user-specified)")
+        print("=" * 80)
+        print()
+
+        rng = np.random.default_rng(self.seed)
+        self.eval_count = self.resume_eval_counter
+        self._best_params = None
+        self._best_objective = float('inf')
+
+        # Generation 1: uniform random initial population
+        generation = self.resume_generation + 1
+        population = self._bmin + self._brange * rng.random((self.population_size, self.n_params))
+        energies = self._evaluate_population(population, generation)
+
+        # Evolve until budget or generation limit is exhausted
+        while self.eval_count < self.max_evaluations and generation < self.resume_generation + self.generations:
+            generation += 1
+            trials = self._make_trials(population, energies, rng)
+            trial_energies = self._evaluate_population(trials, generation)
+
+            # Greedy selection (unevaluated trials have +inf energy and never win)
+            improved = trial_energies < energies
+            population[improved] = trials[improved]
+            energies[improved] = trial_energies[improved]
+
+        if self.eval_count >= self.max_evaluations:
+            message = f"Max evaluations ({self.max_evaluations}) reached"
+        else:
+            message = f"Max generations ({self.generations}) reached"
+
+        best_idx = int(np.argmin(energies))
+
+        print("\n" + "=" * 80)
+        print("OPTIMIZATION COMPLETE")
+        print("=" * 80)
+        print(f"Best Objective:  {energies[best_idx]:.4f}")
+        print(f"Generations:     {generation - self.resume_generation}")
+        print(f"Evaluations:     {self.eval_count}")
+        print(f"Message:         {message}")
+        print("=" * 80)
+        print()
+
+        return OptimizerResult(
+            success=True,
+            best_params=population[best_idx].copy(),
+            best_objective=float(energies[best_idx]),
+            n_evaluations=self.eval_count,
+            message=message,
+            algorithm_name=self.get_algorithm_name(),
+            seed=self.seed
+        )
+
+    def _make_trials(self, population: np.ndarray, energies: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+        """
+        Build the trial population (mutation + binomial crossover + bound repair).
+
+        Out-of-bounds genes are replaced by uniform random values within bounds
+        (whole-matrix mask + select, as scipy does per candidate). Resampling
+        keeps more diversity than clipping, which piles trials onto the bounds.
+
+        Args:
+            population: Current population, shape (N, n_params)
+            energies: Objective values of the current population, shape (N,)
+            rng: Random generator
+
+        Returns:
+            Trial population, shape (N, n_params)
+        """
+        n, k = population.shape
+        rows = np.arange(n)
+
+        # Dithered mutation factor (one F per generation, as in scipy)
+        if isinstance(self.mutation, tuple):
+            f = rng.uniform(self.mutation[0], self.mutation[1])
+        else:
+            f = self.mutation
+
+        # Distinct random partners per individual, never the individual itself
+        keys = rng.random((n, n))
+        keys[rows, rows] = np.inf
+        picks = np.argsort(keys, axis=1)[:, :self._n_picks]
+        r = [population[picks[:, j]] for j in range(self._n_picks)]
+        mutants = self._build_mutants(population[np.argmin(energies)], r, f)
+
+        # Binomial crossover with one forced mutant gene per individual
+        cross = rng.random((n, k)) < self.recombination
+        cross[rows, rng.integers(k, size=n)] = True
+        trials = np.where(cross, mutants, population)
+
+        # Resample out-of-bounds genes uniformly within bounds
+        offset = trials - self._bmin
+        out_of_bounds = (offset < 0) | (offset > self._brange)
+        resampled = self._bmin + self._brange * rng.random((n, k))
+        return np.where(out_of_bounds, resampled, trials)
+
+    def _evaluate_population(self, population: np.ndarray, generation: int) -> np.ndarray:
+        """
+        Evaluate individuals in order until the evaluation budget runs out.
+
+        If the objective function provides evaluate_batch() (e.g. parallel Unity
+        instances), all individuals within the budget are handed over at once.
+
+        Args:
+            population: Individuals to evaluate, shape (N, n_params)
+            generation: Generation number passed to the objective function
+
+        Returns:
+            Objective values, shape (N,) (+inf for individuals not evaluated)
+        """
+        energies = np.full(len(population), np.inf)
+
+        if hasattr(self.objective_function, 'set_generation'):
+            self.objective_function.set_generation(generation)
+
+        evaluate_batch = getattr(self.objective_function, 'evaluate_batch', None)
+        if evaluate_batch is not None:
+            n_allowed = max(0, min(len(population), self.max_evaluations - self.eval_count))
+            if n_allowed < len(population):
+                print(f"\n[Optimizer] Evaluation limit reached ({self.max_evaluations}), "
+                      f"skipping {len(population) - n_allowed} remaining individuals")
+            if n_allowed == 0:
+                return energies
+
+            try:
+                energies[:n_allowed] = evaluate_batch(population[:n_allowed])
+            except BaseException:
+                # Keep the simulations that finished before the failure in the checkpoint
+                self.eval_count += n_allowed
+                self._best_params, self._best_objective = self._checkpoint_failed_batch(
+                    self.eval_count, self._best_params, self._best_objective, generation)
+                raise
+            self.eval_count += n_allowed
+
+            k = int(np.argmin(energies))
+            if energies[k] < self._best_objective:
+                self._best_params = population[k].copy()
+                self._best_objective = energies[k]
+
+            self._save_checkpoint(self.eval_count, self._best_params, self._best_objective, generation)
+            return energies
+
+        for i, params in enumerate(population):
+            if self.eval_count >= self.max_evaluations:
+                print(f"\n[Optimizer] Evaluation limit reached ({self.max_evaluations}), "
+                      f"skipping {len(population) - i} remaining individuals")
+                break
+
+            self.eval_count += 1
+            energies[i] = self.objective_function(params)
+
+            if energies[i] < self._best_objective:
+                self._best_params = params.copy()
+                self._best_objective = energies[i]
+
+            # Save checkpoint every iteration (history flushed after the last one of the generation)
+            self._save_checkpoint(self.eval_count, self._best_params, self._best_objective, generation,
+                                  end_of_generation=i == len(population) - 1)
+
+        return energies
+
+    def get_algorithm_name(self) -> str:
+        """
+        Return algorithm identifier including key hyperparameters.
+
+        Format: NumpyDE_pop{popsize}_{strategy}
+
+        Example: "NumpyDE_pop10_best1bin"
+        """
+        return f"NumpyDE_pop{self.popsize}_{self.strategy}"
+
+
+def test_numpy_de_optimizer():
+    """
+    Test NumPy DE optimizer with a simple quadratic function.
+
+    Minimizes: f(x) = sum(x^2)
+    Expected minimum: x = [0, 0, ..., 0], f(x) = 0
+    """
+    print("=" * 80)
+    print("NUMPY DE OPTIMIZER TEST (Quadratic Function)")
+    print("=" * 80)
+
+    def quadratic(params):
+        return float(np.dot(params, params))  # Fused square+sum, no temporary array
+
+    n_params = 5
+    bounds = [(-5.0, 5.0) for _ in range(n_params)]
+
+    optimizer = NumpyDEOptimizer(
+        bounds=bounds,
+        objective_function=quadratic,
+        max_evaluations=2000,
+        popsize=10,
+        seed=42
+    )
+
+    result = optimizer.optimize()
+
+    print(f"\n[TEST] Results:")
+    print(f"  Algorithm:       {result.algorithm_name}")
+    print(f"  Best Objective:  {result.best_objective:.6f}")
+    print(f"  Best Params:     {result.best_params}")
+    print(f"  Evaluations:     {result.n_evaluations}")
+    print(f"  Expected:        ~0.0 at [0, 0, 0, 0, 0]")
+
+    if result.best_objective < 0.01:
+        print(f"\n[TEST] SUCCESS! Found minimum close to zero.")
+    else:
+        print(f"\n[TEST] Warning: Minimum not reached (try more evaluations)")
+
+
+if __name__ == '__main__':
+    # Run test
+    test_numpy_de_optimizer()
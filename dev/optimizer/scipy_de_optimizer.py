@@ -5,15 +5,15 @@ Wraps scipy.optimize.differential_evolution to conform to BaseOptimizer interfac
 """
 
 import numpy as np
-import pickle
-from pathlib import Path
-from datetime import datetime
-from scipy.optimize import differential_evolution
-from typing import Callable, List, Tuple, Optional
+from typing import Callable, List, Tuple, Optional, Union
 
 from optimizer.base_optimizer import BaseOptimizer, OptimizerResult
 
 
+class _EvaluationLimitReached(Exception):
+    """Raised inside the objective wrappers to end the scipy run mid-generation."""
+
+
 class ScipyDEOptimizer(BaseOptimizer):
     """
     Scipy Differential Evolution optimizer.
@@ -71,12 +71,18 @@ class ScipyDEOptimizer(BaseOptimizer):
         popsize: int = 10,
         generations: Optional[int] = None,
         strategy: str = 'best1bin',
-        mutation: Tuple[float, float] = (0.5, 1.0),
+        mutation: Union[float, Tuple[float, float]] = (0.5, 1.0),
         recombination: float = 0.7,
         atol: float = 0.01,
         tol: float = 0.01,
         resume_eval_counter: int = 0,
-        resume_generation: int = 0
+        resume_generation: int = 0,
+        plateau_generations: Optional[int] = None,
+        plateau_eps: float = 0.0,
+        vectorized: bool = True,
+        disp: bool = False,
+        init_population: Optional[np.ndarray] = None,
+        init_energies: Optional[np.ndarray] = None
     ):
         """
         Initialize Scipy DE optimizer.
@@ -89,12 +95,24 @@ class ScipyDEOptimizer(BaseOptimizer):
             popsize: Population multiplier (actual_pop = popsize × n_params, default: 10, recommended: 5-15)
             generations: Number of generations (default: None = auto-calculate from max_evaluations)
             strategy: DE mutation strategy ('best1bin', 'rand1bin', 'best2bin', etc.)
-            mutation: Mutation factor range (min, max)
+            mutation: Mutation factor F, or (min, max) range for per-generation dithering
             recombination: Crossover probability [0, 1]
             atol: Absolute tolerance for convergence
-            tol: Relative tolerance for convergence
+            tol: Relative tolerance for convergence (lower = more generations before converging = more Unity runs)
             resume_eval_counter: Resume from this evaluation count (default: 0)
             resume_generation: Resume from this generation number (default: 0)
+            plateau_generations: Stop when the best objective has not improved over this many
+                                 generations (default: None = disabled)
+            plateau_eps: Minimum improvement of the best objective that counts as progress (default: 0.0)
+            vectorized: Hand the whole population to the objective wrapper once per generation
+                        (scipy vectorized=True) instead of one call per individual (default: True).
+                        Same evaluation order and results; limit handling is done per batch
+            disp: Let scipy print its per-generation convergence line (default: False)
+            init_population: Warm-start members, shape (M, n_params), e.g. the best rows of a
+                             resumed run's history (default: None = Latin hypercube). Topped up
+                             with Latin hypercube members if M < popsize × n_params
+            init_energies: Known objective values of init_population, shape (M,). These members
+                           are not evaluated again (vectorized=True only; default: None)
         """
         super().__init__(bounds, objective_function, max_evaluations, seed)
 
@@ -106,6 +124,17 @@ class ScipyDEOptimizer(BaseOptimizer):
         self.tol = tol
         self.resume_eval_counter = resume_eval_counter
         self.resume_generation = resume_generation
+        self.plateau_generations = plateau_generations
+        self.plateau_eps = plateau_eps
+        self.vectorized = vectorized
+        self.disp = disp
+        self.init_population = init_population
+        self.init_energies = init_energies
+
+        if self.init_energies is not None and not self.vectorized:
+            print("[Optimizer] WARNING: known initial energies require vectorized=True, "
+                  "re-evaluating the initial population")
+            self.init_energies = None
 
         # Generate random seed if not provided (for reproducibility)
         if seed is None:
@@ -126,13 +155,59 @@ class ScipyDEOptimizer(BaseOptimizer):
             self.maxiter = max_evaluations // (popsize * n_params)
             self.generations = self.maxiter
 
+        # Warm-start initial population, built on first use and reused by later optimize() calls
+        self._init_population = None
+
+    def _get_initial_population(self):
+        """
+        Initial population passed to scipy as init.
+
+        Fresh runs use scipy's own init='latinhypercube' (seeded by scipy, so
+        existing seeds keep their trajectories). Only a warm start builds an
+        explicit matrix: Latin hypercube rows scaled to the bounds, with the
+        warm-start members (init_population) in the first rows. The matrix is
+        cached so repeated optimize() calls reuse it.
+
+        Returns:
+            'latinhypercube', or population matrix of shape (max(5, popsize × n_params), n_params)
+        """
+        if self.init_population is None:
+            return 'latinhypercube'
+        if self._init_population is None:
+            from scipy.stats import qmc
+
+            n_members = max(5, self.popsize * self.n_params)  # scipy's minimum population
+            sample = qmc.LatinHypercube(d=self.n_params, seed=self.seed).random(n_members)
+            population = qmc.scale(sample, self._lo, self._hi)
+            warm = np.clip(np.asarray(self.init_population, dtype=np.float64)[:n_members], self._lo, self._hi)
+            population[:len(warm)] = warm
+            self._init_population = population
+        return self._init_population
+
+    def _get_initial_energies(self) -> Optional[np.ndarray]:
+        """
+        Known objective values of the initial population (NaN = must be evaluated).
+
+        Returns:
+            Energy vector aligned with _get_initial_population(), or None if nothing is known
+        """
+        if self.init_energies is None or self.init_population is None:
+            return None
+        population = self._get_initial_population()
+        energies = np.full(len(population), np.nan)
+        known = np.asarray(self.init_energies, dtype=np.float64)[:len(population)]
+        energies[:len(known)] = known
+        return energies
+
     def optimize(self) -> OptimizerResult:
         """
         Run Scipy Differential Evolution optimization.
 
-        Uses callback mechanism to ensure exact evaluation count:
-        - Scipy maxiter is set high (maxiter * 10)
-        - Callback counts evaluations and stops when limit reached
+        Ensures an exact evaluation count:
+        - Scipy maxiter covers the whole evaluation budget
+        - Callback stops after a generation once the limit is reached
+        - If the limit falls mid-generation, the wrapper aborts the scipy run
+          (no penalty values are evaluated or returned)
         - This guarantees exactly max_evaluations evaluations
 
         Returns:
@@ -149,6 +224,10 @@ class ScipyDEOptimizer(BaseOptimizer):
         print(f"Strategy:        {self.strategy}")
         print(f"Mutation:        {self.mutation}")
         print(f"Recombination:   {self.recombination}")
+        print(f"Tolerance:       tol={self.tol}, atol={self.atol}")
+        print(f"Vectorized:      {self.vectorized}")
+        if self.plateau_generations:
+            print(f"Plateau Stop:    {self.plateau_generations} generations (eps={self.plateau_eps})")
         if self.seed_was_random:
             print(f"Random Seed:     {self.seed} (auto-generated, use --seed {self.seed} to reproduce)")
         else:
@@ -160,48 +239,164 @@ class ScipyDEOptimizer(BaseOptimizer):
         eval_counter = [self.resume_eval_counter]
         current_generation = [self.resume_generation]  # Track current generation number
         termination_flag = [False]
+        plateau_flag = [False]
         best_params = [None]
         best_objective = [float('inf')]
 
+        # Resolved once instead of per evaluation (closures read locals, not self attributes)
+        # Population size = popsize × n_params
+        population_size = self.popsize * len(self.bounds)
+        max_evaluations = self.max_evaluations
+        objective_function = self.objective_function
+        save_checkpoint = self._save_checkpoint
+        set_generation = getattr(objective_function, 'set_generation', None)
+        reported_generation = [None]  # Last generation passed to set_generation()
+        pending_init_energies = [self._get_initial_energies()]  # Consumed by the first batch
+
         # Objective function wrapper (counts evaluations and enforces limit)
         def objective_wrapper(params):
+            # Check limit BEFORE running evaluation (abort scipy instead of returning a penalty)
+            if eval_counter[0] >= max_evaluations:
+                print(f"\n[Optimizer] Evaluation limit reached ({max_evaluations}), stopping mid-generation")
+                termination_flag[0] = True
+                raise _EvaluationLimitReached()
+
             eval_counter[0] += 1
             self.eval_count = eval_counter[0]
 
             # Calculate current generation (1-indexed)
-            # Population size = popsize × n_params
-            population_size = self.popsize * len(self.bounds)
             current_generation[0] = ((eval_counter[0] - 1) // population_size) + 1
 
-            # Check if limit exceeded BEFORE running evaluation
-            if eval_counter[0] > self.max_evaluations:
-                print(f"\n[Optimizer] Evaluation limit reached ({self.max_evaluations}), skipping eval {eval_counter[0]}")
-                termination_flag[0] = True
-                # Return large penalty to signal termination
-                return 1e10
-
-            # Pass generation number to objective function
-            if hasattr(self.objective_function, 'set_generation'):
-                self.objective_function.set_generation(current_generation[0])
+            # Pass generation number to objective function (only when it changes)
+            if set_generation is not None and current_generation[0] != reported_generation[0]:
+                set_generation(current_generation[0])
+                reported_generation[0] = current_generation[0]
 
             # Evaluate objective
-            result = self.objective_function(params)
+            result = objective_function(params)
 
             # Update best solution
             if result < best_objective[0]:
                 best_params[0] = params.copy()
                 best_objective[0] = result
 
-            # Save checkpoint every iteration
-            self._save_checkpoint(eval_counter[0], best_params[0], best_objective[0], current_generation[0])
+            # Save checkpoint every iteration (history flushed at the end of each generation)
+            save_checkpoint(eval_counter[0], best_params[0], best_objective[0], current_generation[0],
+                            end_of_generation=eval_counter[0] % population_size == 0)
 
             return result
 
-        # Callback to enforce evaluation limit (called after each generation)
+        # Batch evaluation hook (e.g. ParallelObjectiveFunction runs several Unity instances)
+        evaluate_batch = getattr(objective_function, 'evaluate_batch', None)
+
+        # Vectorized wrapper (whole generation per call)
+        def batch_wrapper(params_batch):
+            """
+            Evaluate a whole population in one call (scipy vectorized=True).
+
+            The evaluation limit is applied to the batch up front: only the
+            candidates within it are evaluated, then the scipy run is aborted
+            (no penalty values enter the population). If the objective function
+            provides evaluate_batch(), the candidates are handed over at once
+            (checkpoint saved after the batch). Otherwise they are evaluated in
+            order (checkpoint saved after every evaluation).
+
+            Args:
+                params_batch: Population matrix, shape (n_params, S)
+
+            Returns:
+                Objective values, shape (S,)
+            """
+            # First batch is the initial population: members with known energies
+            # (warm start from a resumed run) are not evaluated again
+            known = pending_init_energies[0]
+            if known is not None:
+                pending_init_energies[0] = None
+                if len(known) == params_batch.shape[1]:
+                    energies = known.copy()
+                    is_known = ~np.isnan(energies)
+                    if is_known.any():
+                        k = int(np.nanargmin(energies))
+                        if energies[k] < best_objective[0]:
+                            best_params[0] = params_batch[:, k].copy()
+                            best_objective[0] = energies[k]
+                    if not is_known.all():
+                        energies[~is_known] = batch_wrapper(params_batch[:, ~is_known])
+                    return energies
+
+            candidates = params_batch.T
+            n_allowed = max(0, min(len(candidates), max_evaluations - eval_counter[0]))
+            energies = np.empty(len(candidates))
+
+            if n_allowed == 0:
+                pass
+            elif evaluate_batch is None:
+                for i in range(n_allowed):
+                    # Generation of this candidate (1-indexed); told to the objective when it changes
+                    generation = (eval_counter[0] // population_size) + 1
+                    if set_generation is not None and generation != reported_generation[0]:
+                        set_generation(generation)
+                        reported_generation[0] = generation
+                    current_generation[0] = generation
+
+                    eval_counter[0] += 1
+                    self.eval_count = eval_counter[0]
+                    energies[i] = objective_function(candidates[i])
+
+                    # Update best solution
+                    if energies[i] < best_objective[0]:
+                        best_params[0] = candidates[i].copy()
+                        best_objective[0] = energies[i]
+
+                    # Save checkpoint every iteration (history flushed after the last one of the batch)
+                    save_checkpoint(eval_counter[0], best_params[0], best_objective[0], current_generation[0],
+                                    end_of_generation=i == n_allowed - 1)
+            else:
+                # Generation of the first candidate in the batch (1-indexed)
+                current_generation[0] = (eval_counter[0] // population_size) + 1
+                if set_generation is not None:
+                    set_generation(current_generation[0])
+                    reported_generation[0] = current_generation[0]
+
+                try:
+                    energies[:n_allowed] = evaluate_batch(candidates[:n_allowed])
+                except BaseException:
+                    # Keep the simulations that finished before the failure in the checkpoint
+                    eval_counter[0] += n_allowed
+                    self.eval_count = eval_counter[0]
+                    best_params[0], best_objective[0] = self._checkpoint_failed_batch(
+                        eval_counter[0], best_params[0], best_objective[0], current_generation[0])
+                    raise
+                eval_counter[0] += n_allowed
+                self.eval_count = eval_counter[0]
+
+                # Update best solution
+                k = int(np.argmin(energies[:n_allowed]))
+                if energies[k] < best_objective[0]:
+                    best_params[0] = candidates[k].copy()
+                    best_objective[0] = energies[k]
+
+                save_checkpoint(eval_counter[0], best_params[0], best_objective[0], current_generation[0])
+
+            if n_allowed < len(candidates):
+                print(f"\n[Optimizer] Evaluation limit reached ({max_evaluations}), "
+                      f"skipping {len(candidates) - n_allowed} evals")
+                termination_flag[0] = True
+                raise _EvaluationLimitReached()
+
+            return energies
+
+        # History tracker (used for plateau detection)
+        history = getattr(objective_function, 'history', None)
+
+        # Callback to enforce evaluation limit and plateau stop (called after each generation)
         def callback(xk, convergence):
             """
             Callback called after each generation.
 
+            Stops when the evaluation limit is reached, or when the best objective
+            has not improved by plateau_eps over the last plateau_generations generations.
+
             Args:
                 xk: Current best solution
                 convergence: Convergence metric
@@ -209,59 +404,82 @@ class ScipyDEOptimizer(BaseOptimizer):
             Returns:
                 True to stop optimization, False to continue
             """
-            if eval_counter[0] >= self.max_evaluations:
+            if eval_counter[0] >= max_evaluations:
                 print(f"\n[Optimizer] Stopping optimization: {eval_counter[0]} evaluations completed")
                 termination_flag[0] = True
                 return True  # Stop optimization
+
+            if self.plateau_generations and history is not None:
+                if history.has_plateaued(self.plateau_generations, self.plateau_eps):
+                    print(f"\n[Optimizer] Stopping optimization: no improvement > {self.plateau_eps} "
+                          f"over last {self.plateau_generations} generations")
+                    plateau_flag[0] = True
+                    return True  # Stop optimization
             return False  # Continue
 
+        # Imported here so that importing this module (e.g. run_optimization.py with
+        # --algorithm numpy_de) does not pay for loading scipy
+        from scipy.optimize import differential_evolution
+
         # Run Differential Evolution
         print("Starting optimization...")
         print(f"Note: Callback will stop at exactly {self.max_evaluations} evaluations")
         print()
 
-        # Set scipy maxiter high, callback will enforce actual limit
-        scipy_maxiter = self.maxiter * 10
-
-        result = differential_evolution(
-            func=objective_wrapper,
-            bounds=self.bounds,
-            strategy=self.strategy,
-            maxiter=scipy_maxiter,
-            popsize=self.popsize,
-            mutation=self.mutation,
-            recombination=self.recombination,
-            atol=self.atol,
-            tol=self.tol,
-            seed=self.seed,
-            disp=False,  # Suppress scipy output (we print our own)
-            polish=False,  # No local polish (stays within bounds)
-            workers=1,  # Single worker (Unity can't run in parallel)
-            updating='deferred',  # Update population after all evaluations
-            callback=callback
-        )
+        # Enough generations for the whole budget (initial population + maxiter generations),
+        # the callback/wrappers enforce the actual limit
+        scipy_maxiter = max(self.maxiter, -(-self.max_evaluations // population_size))
+
+        try:
+            result = differential_evolution(
+                func=batch_wrapper if self.vectorized else objective_wrapper,
+                bounds=self.bounds,
+                strategy=self.strategy,
+                maxiter=scipy_maxiter,
+                popsize=self.popsize,
+                init=self._get_initial_population(),
+                mutation=self.mutation,
+                recombination=self.recombination,
+                atol=self.atol,
+                tol=self.tol,
+                seed=self.seed,
+                disp=self.disp,  # Off by default (we print our own progress)
+                polish=False,  # No local polish (stays within bounds)
+                workers=1,  # Parallelism (if any) happens inside batch_wrapper via evaluate_batch
+                updating='deferred',  # Update population after all evaluations (required for vectorized)
+                vectorized=self.vectorized,
+                callback=callback
+            )
+            success, best_x, best_fun, nit = result.success, result.x, result.fun, result.nit
+            message = result.message
+        except _EvaluationLimitReached:
+            # Budget ran out mid-generation: report the best evaluated solution
+            success, best_x, best_fun = True, best_params[0], best_objective[0]
+            nit = max(0, current_generation[0] - self.resume_generation - 1)
+            message = None
 
         # Update message if terminated by callback
-        message = result.message
         if termination_flag[0]:
             message = f"Max evaluations ({self.max_evaluations}) reached"
+        elif plateau_flag[0]:
+            message = f"Best objective plateaued for {self.plateau_generations} generations"
 
         # Print summary
         print("\n" + "=" * 80)
         print("OPTIMIZATION COMPLETE")
         print("=" * 80)
-        print(f"Success:         {result.success or termination_flag[0]}")
-        print(f"Best Objective:  {result.fun:.4f}")
-        print(f"Iterations:      {result.nit}")
+        print(f"Success:         {success or termination_flag[0] or plateau_flag[0]}")
+        print(f"Best Objective:  {best_fun:.4f}")
+        print(f"Iterations:      {nit}")
         print(f"Evaluations:     {eval_counter[0]}")
         print(f"Message:         {message}")
         print("=" * 80)
         print()
 
         return OptimizerResult(
-            success=result.success or termination_flag[0],
-            best_params=result.x,
-            best_objective=result.fun,
+            success=success or termination_flag[0] or plateau_flag[0],
+            best_params=best_x,
+            best_objective=best_fun,
             n_evaluations=eval_counter[0],
             message=message,
             algorithm_name=self.get_algorithm_name(),
@@ -278,44 +496,6 @@ class ScipyDEOptimizer(BaseOptimizer):
         """
         return f"ScipyDE_pop{self.popsize}_{self.strategy}"
 
-    def _save_checkpoint(self, eval_counter: int, best_params: np.ndarray, best_objective: float, generation: int = 0):
-        """
-        Save checkpoint after every evaluation.
-
-        Args:
-            eval_counter: Current evaluation number
-            best_params: Best parameters found so far
-            best_objective: Best objective value found so far
-            generation: Current generation number
-        """
-        if best_params is None:
-            return  # Skip if no best solution yet
-
-        # Get history CSV path from objective function
-        history_csv_path = None
-        if hasattr(self.objective_function, 'history') and self.objective_function.history:
-            history_csv_path = str(self.objective_function.history.output_path)
-
-        checkpoint = {
-            'eval_counter': eval_counter,
-            'generation': generation,
-            'best_params': best_params,
-            'best_objective': best_objective,
-            'random_state': np.random.get_state(),
-            'history_csv': history_csv_path,
-            'algorithm': self.get_algorithm_name(),
-            'popsize': self.popsize,
-            'seed': self.seed,
-            'max_evaluations': self.max_evaluations,
-            'timestamp': datetime.now().isoformat()
-        }
-
-        checkpoint_path = Path("data/output/checkpoint_latest.pkl")
-        checkpoint_path.parent.mkdir(parents=True, exist_ok=True)
-
-        with open(checkpoint_path, 'wb') as f:
-            pickle.dump(checkpoint, f)
-
 
 def test_scipy_de_optimizer():
     """
@@ -330,7 +510,7 @@ def test_scipy_de_optimizer():
 
     # Simple test function: sum of squares
     def quadratic(params):
-        return np.sum(params ** 2)
+        return float(np.dot(params, params))  # Fused square+sum, no temporary array
 
     # Bounds: [-5, 5] for each parameter
     n_params = 5
@@ -17,50 +17,169 @@ Usage:
     # Reproducible run (specify seed)
     python run_optimization.py --algorithm scipy_de --seed 42
 
+    # NumPy DE core (same options, exact evaluation budget)
+    python run_optimization.py --algorithm numpy_de --popsize 4 --generations 10
+
+    # Parallel: one Unity Editor per project clone (3 simulations at once)
+    python run_optimization.py --algorithm scipy_de --project-path D:/P01_a D:/P01_b D:/P01_c
+
+    # Check evaluation count and time estimate without starting Unity
+    python run_optimization.py --algorithm scipy_de --popsize 5 --generations 6 --dry-run
+
 Future algorithms:
     python run_optimization.py --algorithm bayesian
     python run_optimization.py --algorithm cmaes
 """
 
 import argparse
+import importlib.util
 import json
+import shlex
+import shutil
+import signal
+import subprocess
 import sys
-import pickle
-import numpy as np
+import tempfile
+from dataclasses import dataclass
 from pathlib import Path
 from datetime import datetime
+from typing import Optional
+
+# Optional: orjson serializes result files faster and handles numpy values (falls back to stdlib json)
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # Add dev directory to path
-sys.path.append(str(Path(__file__).parent))
+_DEV_DIR = str(Path(__file__).parent)
+if _DEV_DIR not in sys.path:  # Already there when run as a dev/ script
+    sys.path.append(_DEV_DIR)
+
+# numpy, core and optimizer modules are imported after argument parsing
+# (in main() / the functions using them) so that --help returns immediately
+
+# Shown in the banner when --project-path is not given (UnitySimulator default)
+DEFAULT_PROJECT_DISPLAY = "D:\\UnityProjects\\META_VERYOLD_P01_s"
+
+# Minimum free disk space in the output directory (history, archived results, checkpoints)
+MIN_FREE_DISK_BYTES = 1024 ** 3
+
+# Average wall time of one Unity simulation (for the run time estimate)
+MINUTES_PER_EVALUATION = 7
+
+# Differential Evolution algorithms (CLI name -> algorithm name prefix)
+DE_ALGORITHMS = {
+    'scipy_de': 'ScipyDE',
+    'numpy_de': 'NumpyDE',
+}
 
-from core.unity_simulator import UnitySimulator
-from core.objective_function import ObjectiveFunction
-from core.parameter_utils import load_parameter_bounds, params_array_to_dict
-from core.history_tracker import OptimizationHistory
-from optimizer.scipy_de_optimizer import ScipyDEOptimizer
 
+@dataclass
+class RunConfig:
+    """Evaluation budget of a run, derived once from the CLI arguments (and checkpoint on resume)."""
+    n_params: int
+    population_size: int  # popsize × n_params individuals per generation
+    max_evaluations: int
+    completed_evals: int  # Already done before this run (resume), 0 for a new run
+    auto_budget: bool  # max_evaluations = popsize × n_params × generations
+    n_workers: int  # Parallel Unity instances (one per project path)
 
-def load_checkpoint(checkpoint_path="data/output/checkpoint_latest.pkl"):
+    @property
+    def remaining_evals(self) -> int:
+        return self.max_evaluations - self.completed_evals
+
+    @property
+    def estimated_hours(self) -> float:
+        return self.remaining_evals * MINUTES_PER_EVALUATION / 60 / self.n_workers
+
+
+def build_run_config(args, n_params: int, checkpoint: Optional[dict] = None) -> RunConfig:
     """
-    Load checkpoint file.
+    Compute the evaluation budget.
 
     Args:
-        checkpoint_path: Path to checkpoint file
+        args: Argparse namespace
+        n_params: Number of optimized parameters
+        checkpoint: Checkpoint dict when resuming (keeps its max_evaluations)
 
     Returns:
-        Dictionary with checkpoint data
+        RunConfig
+    """
+    if checkpoint is not None:
+        max_evaluations = checkpoint['max_evaluations']
+        completed_evals = checkpoint['eval_counter']
+    elif args.max_evals is None:
+        max_evaluations = args.popsize * n_params * args.generations
+        completed_evals = 0
+    else:
+        max_evaluations = args.max_evals
+        completed_evals = 0
+
+    return RunConfig(
+        n_params=n_params,
+        population_size=args.popsize * n_params,
+        max_evaluations=max_evaluations,
+        completed_evals=completed_evals,
+        auto_budget=checkpoint is None and args.max_evals is None,
+        n_workers=len(args.project_path)
+    )
+
+
+class _Terminated(KeyboardInterrupt):
+    """SIGTERM delivered as an interrupt, so it takes the same cleanup path as Ctrl+C."""
 
-    Raises:
-        FileNotFoundError: If checkpoint file not found
+
+def _raise_terminated(signum, frame):
+    raise _Terminated()
+
+
+def preflight_check(args) -> list:
+    """
+    Check paths and disk space before anything is started.
+
+    Catches typos in --project-path / --output-dir up front instead of after
+    the confirmation prompt, when the Unity simulators are created, and a
+    missing analysis module instead of after the run has finished.
+
+    Args:
+        args: Argparse namespace
+
+    Returns:
+        List of problem descriptions (empty = all checks passed)
     """
-    path = Path(checkpoint_path)
-    if not path.exists():
-        raise FileNotFoundError(f"Checkpoint not found: {checkpoint_path}")
+    problems = []
+
+    for project_path in args.project_path:
+        project = Path(project_path or DEFAULT_PROJECT_DISPLAY)
+        if not (project / "Assets").is_dir():
+            problems.append(f"Unity project not found (no Assets folder): {project}")
 
-    with open(path, 'rb') as f:
-        checkpoint = pickle.load(f)
+    if args.unity_path and not Path(args.unity_path).exists():
+        problems.append(f"Unity Editor not found: {args.unity_path}")
 
-    return checkpoint
+    output_dir = Path(args.output_dir)
+    try:
+        output_dir.mkdir(parents=True, exist_ok=True)
+        with tempfile.TemporaryFile(dir=output_dir):
+            pass
+    except OSError as e:
+        problems.append(f"Output directory not writable: {output_dir} ({e})")
+    else:
+        free = shutil.disk_usage(output_dir).free
+        if free < MIN_FREE_DISK_BYTES:
+            problems.append(f"Less than {MIN_FREE_DISK_BYTES / 1024 ** 3:.0f} GB free in {output_dir} "
+                            f"({free / 1024 ** 2:.0f} MB)")
+
+    if not args.skip_analysis:
+        if importlib.util.find_spec('analysis.analyze_history') is None:
+            problems.append("analysis/analyze_history.py not found (use --skip-analysis to run without it)")
+        elif importlib.util.find_spec('matplotlib') is None:
+            # Not fatal: the analysis still runs, only the plot is skipped
+            print("WARNING: matplotlib not installed, the convergence plot will be skipped "
+                  "(pip install matplotlib)")
+
+    return problems
 
 
 def create_optimizer(args, bounds, objective_function, max_evaluations, checkpoint=None):
@@ -78,10 +197,22 @@ def create_optimizer(args, bounds, objective_function, max_evaluations, checkpoi
         BaseOptimizer instance
     """
     if args.algorithm == 'scipy_de':
+        from optimizer.scipy_de_optimizer import ScipyDEOptimizer
+
         # Extract resume info from checkpoint
         resume_eval = checkpoint.get('eval_counter', 0) if checkpoint else 0
         resume_gen = checkpoint.get('generation', 0) if checkpoint else 0
 
+        # Resume: start from the best evaluated members instead of a fresh population
+        # (their objectives are known, so they are not simulated again)
+        init_population = init_energies = None
+        if checkpoint and checkpoint.get('history_csv') and Path(checkpoint['history_csv']).exists():
+            from core.history_tracker import load_population_from_history
+            init_population, init_energies = load_population_from_history(
+                checkpoint['history_csv'], args.popsize * len(bounds)
+            )
+            print(f"Warm start: {len(init_population)} members from {checkpoint['history_csv']}")
+
         return ScipyDEOptimizer(
             bounds=bounds,
             objective_function=objective_function,
@@ -91,6 +222,34 @@ def create_optimizer(args, bounds, objective_function, max_evaluations, checkpoi
             generations=args.generations,
             strategy=args.strategy,
             resume_eval_counter=resume_eval,
+            resume_generation=resume_gen,
+            plateau_generations=args.plateau_gens,
+            plateau_eps=args.plateau_eps,
+            mutation=args.mutation,
+            recombination=args.recombination,
+            tol=args.tol,
+            disp=args.disp,
+            vectorized=args.vectorized,
+            init_population=init_population,
+            init_energies=init_energies
+        )
+    elif args.algorithm == 'numpy_de':
+        from optimizer.numpy_de_optimizer import NumpyDEOptimizer
+
+        resume_eval = checkpoint.get('eval_counter', 0) if checkpoint else 0
+        resume_gen = checkpoint.get('generation', 0) if checkpoint else 0
+
+        return NumpyDEOptimizer(
+            bounds=bounds,
+            objective_function=objective_function,
+            max_evaluations=max_evaluations,
+            seed=args.seed,
+            popsize=args.popsize,
+            generations=args.generations,
+            strategy=args.strategy,
+            mutation=args.mutation,
+            recombination=args.recombination,
+            resume_eval_counter=resume_eval,
             resume_generation=resume_gen
         )
     # Future algorithms:
@@ -102,7 +261,24 @@ def create_optimizer(args, bounds, objective_function, max_evaluations, checkpoi
         raise ValueError(f"Unknown algorithm: {args.algorithm}")
 
 
-def save_results(result, output_dir: Path, history_csv: Path = None):
+def write_json(filepath: Path, data: dict):
+    """
+    Write data as indented JSON (orjson in one write if available, else stdlib json).
+
+    Args:
+        filepath: Output file path
+        data: JSON-serializable dict (numpy arrays/scalars allowed with orjson)
+    """
+    if orjson is not None:
+        with open(filepath, 'wb') as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY))
+    else:
+        with open(filepath, 'w') as f:
+            json.dump(data, f, indent=2)
+
+
+def save_results(result, output_dir: Path, history_csv: Path = None, run_token: str = None,
+                 top_k: int = 1):
     """
     Save optimization results to JSON file.
 
@@ -110,6 +286,13 @@ def save_results(result, output_dir: Path, history_csv: Path = None):
         result: OptimizerResult object
         output_dir: Directory to save results
         history_csv: Path to history CSV to extract true best result
+        run_token: Timestamp token of this run, used when there is no history CSV
+                   (default: current time)
+        top_k: Also save the K best evaluations from the history CSV as 'top_k'
+               (default: 1 = best only, no 'top_k' entry)
+
+    Returns:
+        (result file path, saved result dict)
     """
     output_dir.mkdir(parents=True, exist_ok=True)
 
@@ -119,27 +302,45 @@ def save_results(result, output_dir: Path, history_csv: Path = None):
         filename = history_csv.stem.replace('history_', 'result_') + '.json'
     else:
         # Fallback to timestamp-based naming
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        timestamp = run_token or datetime.now().strftime("%Y%m%d_%H%M%S")
         filename = f"result_{result.algorithm_name}_{timestamp}.json"
 
     filepath = output_dir / filename
 
+    from core.parameter_utils import params_array_to_dict
+
     # Convert to JSON-serializable format
     result_dict = result.to_dict()
 
     # Override with true best from history CSV (if available)
     if history_csv and history_csv.exists():
         import csv
-        with open(history_csv, 'r') as f:
-            reader = csv.DictReader(f)
-            rows = list(reader)
-
-        if rows:
-            # Find true best
-            best_row = min(rows, key=lambda r: float(r['objective']))
+        import heapq
+        # Single pass keeping the k best rows in a bounded heap (first one wins on ties).
+        # Rows stay plain lists; only the objective column is parsed and
+        # only the kept rows are turned into dicts.
+        top_k = max(1, top_k)
+        heap = []  # (-objective, -row index, row): heap[0] is the worst kept row
+        n_rows = 0
+        with open(history_csv, 'r', newline='') as f:
+            reader = csv.reader(f)
+            header = next(reader, [])
+            if header:  # Empty file: fall through to the optimizer result below
+                objective_col = header.index('objective')
+                for row in reader:
+                    item = (-float(row[objective_col]), -n_rows, row)
+                    n_rows += 1
+                    if len(heap) < top_k:
+                        heapq.heappush(heap, item)
+                    elif item > heap[0]:
+                        heapq.heapreplace(heap, item)
+        ranked = [dict(zip(header, row)) for _, _, row in sorted(heap, reverse=True)]
+
+        if ranked:
+            best_row = ranked[0]
+            best_objective = float(best_row['objective'])
             best_iteration = int(best_row['iteration'])
             best_generation = int(best_row['generation'])
-            best_objective = float(best_row['objective'])
 
             # Extract best parameters
             from export_to_unity import PARAMETER_NAMES
@@ -148,10 +349,10 @@ def save_results(result, output_dir: Path, history_csv: Path = None):
             # Override optimizer result with true best
             result_dict['best_objective'] = best_objective
             result_dict['best_params'] = best_params
-            result_dict['best_params_dict'] = params_array_to_dict(np.array(best_params))
+            result_dict['best_params_dict'] = dict(zip(PARAMETER_NAMES, best_params))  # Already floats in name order
             result_dict['best_iteration'] = best_iteration
             result_dict['best_generation'] = best_generation
-            result_dict['n_evaluations'] = len(rows)
+            result_dict['n_evaluations'] = n_rows
 
             # Add metrics from best evaluation
             result_dict['best_metrics'] = {
@@ -160,16 +361,26 @@ def save_results(result, output_dir: Path, history_csv: Path = None):
                 'time_growth': float(best_row.get('time_growth', 0)),
                 'density_diff': float(best_row.get('density_diff', 0))
             }
+
+            if top_k > 1:
+                result_dict['top_k'] = [
+                    {
+                        'iteration': int(row['iteration']),
+                        'generation': int(row['generation']),
+                        'objective': float(row['objective']),
+                        'params_dict': {name: float(row[name]) for name in PARAMETER_NAMES}
+                    }
+                    for row in ranked
+                ]
     else:
         # Fallback: use optimizer result as-is
         result_dict['best_params_dict'] = params_array_to_dict(result.best_params)
 
     # Save
-    with open(filepath, 'w') as f:
-        json.dump(result_dict, f, indent=2)
+    write_json(filepath, result_dict)
 
     print(f"Results saved: {filepath}")
-    return filepath
+    return filepath, result_dict
 
 
 def main():
@@ -192,13 +403,16 @@ Examples:
 
   # Custom Unity path
   python run_optimization.py --algorithm scipy_de --unity-path "C:/Unity/Editor/Unity.exe"
+
+  # Parallel (each project clone open in its own Unity Editor)
+  python run_optimization.py --algorithm scipy_de --project-path D:/P01_a D:/P01_b
         """
     )
 
     # Required arguments
     parser.add_argument(
         '--algorithm',
-        choices=['scipy_de'],  # Future: 'bayesian', 'cmaes', 'pso'
+        choices=list(DE_ALGORITHMS),  # Future: 'bayesian', 'cmaes', 'pso'
         default='scipy_de',
         help='Optimization algorithm to use'
     )
@@ -225,8 +439,11 @@ Examples:
     parser.add_argument(
         '--project-path',
         type=str,
-        default=None,
-        help='Path to Unity project (default: D:/UnityProjects/META_VERYOLD_P01_s)'
+        nargs='+',
+        default=[None],
+        help='Path to Unity project (default: D:/UnityProjects/META_VERYOLD_P01_s). '
+             'Multiple paths = parallel simulations, one Unity Editor per project clone '
+             '(number of parallel workers = number of paths)'
     )
     parser.add_argument(
         '--timeout',
@@ -240,35 +457,153 @@ Examples:
         default='data/output',
         help='Output directory for results (default: data/output)'
     )
+    parser.add_argument(
+        '--allow-cache',
+        action='store_true',
+        help='Reuse results of previously evaluated parameter sets (rounded to 6 decimals) '
+             'instead of re-running Unity. Cache: <output-dir>/optimization_cache.jsonl'
+    )
+    parser.add_argument(
+        '--quiet',
+        action='store_true',
+        help='Suppress per-evaluation Unity/objective progress output (results are still written to history CSV)'
+    )
+    parser.add_argument(
+        '--history-flush-every',
+        type=int,
+        default=1,
+        metavar='N',
+        help='Write history CSV rows to disk every N evaluations (default: 1). Larger values batch writes '
+             'for fast objectives; the end of every generation (before its checkpoint), Ctrl+C and normal '
+             'exit still flush. Checkpoints are saved after every evaluation (after every batch with several '
+             '--project-path), so a hard crash mid-generation loses up to N-1 rows the checkpoint counts'
+    )
+    parser.add_argument(
+        '-y', '--yes',
+        action='store_true',
+        help='Skip confirmation prompts (also skipped automatically when stdin is not a terminal)'
+    )
+    parser.add_argument(
+        '--top-k',
+        type=int,
+        default=1,
+        metavar='K',
+        help='Also save the K best evaluations (iteration, objective, parameters) in the result JSON '
+             'as "top_k" (default: 1 = best only)'
+    )
+    parser.add_argument(
+        '--skip-analysis',
+        action='store_true',
+        help='Do not run the history analysis and convergence plot after optimization'
+    )
+    parser.add_argument(
+        '--dry-run',
+        action='store_true',
+        help='Print the configuration and time estimate, then exit without starting Unity '
+             '(skips the project/disk preflight check)'
+    )
     parser.add_argument(
         '--resume',
         action='store_true',
-        help='Resume from latest checkpoint (data/output/checkpoint_latest.pkl)'
+        help='Resume from latest checkpoint (data/output/checkpoint_state.json)'
     )
 
-    # Scipy DE specific arguments
+    # Differential Evolution arguments (scipy_de, numpy_de)
     parser.add_argument(
         '--popsize',
         type=int,
         default=10,
-        help='[Scipy DE] Population multiplier: actual_pop = popsize × 18 params (default: 10 → 180 individuals/gen)'
+        help='[DE] Population multiplier: actual_pop = popsize × 18 params (default: 10 → 180 individuals/gen)'
     )
     parser.add_argument(
         '--generations',
         type=int,
         default=4,
-        help='[Scipy DE] Number of generations (default: 4)'
+        help='[DE] Number of generations (default: 4)'
     )
     parser.add_argument(
         '--strategy',
         type=str,
         default='best1bin',
         choices=['best1bin', 'best2bin', 'rand1bin', 'rand2bin'],
-        help='[Scipy DE] Mutation strategy (default: best1bin)'
+        help='[DE] Mutation strategy (default: best1bin)'
+    )
+    parser.add_argument(
+        '--mutation',
+        type=float,
+        nargs='+',
+        default=[0.5, 1.0],
+        metavar='F',
+        help='[DE] Mutation factor: one value = constant F, two values = dithering range MIN MAX (default: 0.5 1.0)'
+    )
+    parser.add_argument(
+        '--recombination',
+        type=float,
+        default=0.7,
+        help='[DE] Crossover probability [0, 1] (default: 0.7)'
+    )
+    parser.add_argument(
+        '--tol',
+        type=float,
+        default=0.01,
+        help='[Scipy DE] Relative convergence tolerance (default: 0.01). Lower = converges later = more Unity runs'
+    )
+    parser.add_argument(
+        '--disp',
+        action='store_true',
+        help="[Scipy DE] Print scipy's per-generation convergence line (default: off)"
+    )
+    parser.add_argument(
+        '--vectorized',
+        action=argparse.BooleanOptionalAction,
+        default=True,
+        help='[Scipy DE] Hand each generation to the objective as one batch (default: on). '
+             'Needed for parallel --project-path runs; --no-vectorized evaluates one individual per scipy call'
+    )
+    parser.add_argument(
+        '--plateau-gens',
+        type=int,
+        default=None,
+        help='[Scipy DE] Stop early if best objective does not improve over this many generations (default: None = disabled)'
+    )
+    parser.add_argument(
+        '--plateau-eps',
+        type=float,
+        default=0.0,
+        help='[Scipy DE] Minimum best-objective improvement counted as progress for --plateau-gens (default: 0.0)'
     )
 
     args = parser.parse_args()
 
+    # --mutation: constant F or (min, max) dithering range
+    if len(args.mutation) == 1:
+        args.mutation = args.mutation[0]
+    elif len(args.mutation) == 2:
+        args.mutation = tuple(args.mutation)
+    else:
+        parser.error("--mutation takes one value (F) or two values (MIN MAX)")
+
+    # One timestamp per run, shared by the history CSV, result JSON and plot file names
+    run_token = datetime.now().strftime("%Y%m%d_%H%M%S")
+
+    # Dry run only prints the configuration, so it must not need the Unity project,
+    # free disk space or create the output directory
+    problems = [] if args.dry_run else preflight_check(args)
+    if problems:
+        print("ERROR: Preflight check failed")
+        for problem in problems:
+            print(f"  - {problem}")
+        print("Fix the problems above and run again.")
+        sys.exit(2)
+
+    import numpy as np
+    from core.parameter_utils import load_parameter_bounds
+    from core.checkpoint import load_checkpoint
+
+    # Parameter bounds (shared by resume and normal mode)
+    bounds = load_parameter_bounds()
+    n_params = len(bounds)
+
     # Check for resume mode
     if args.resume:
         try:
@@ -286,29 +621,34 @@ Examples:
             print()
 
             # Validation - check algorithm match
-            expected_algo = f"ScipyDE_pop{args.popsize}_{args.strategy}"
+            expected_algo = f"{DE_ALGORITHMS[args.algorithm]}_pop{args.popsize}_{args.strategy}"
             if checkpoint['algorithm'] != expected_algo:
                 print(f"WARNING: Algorithm mismatch!")
                 print(f"  Checkpoint: {checkpoint['algorithm']}")
                 print(f"  Current:    {expected_algo}")
-                response = input("Continue anyway? (y/n): ")
-                if response.lower() != 'y':
-                    print("Cancelled.")
+                if args.yes:
+                    print("Continuing anyway (--yes)")
+                elif not sys.stdin.isatty():
+                    print("Cancelled (non-interactive, use --yes to accept the mismatch).")
                     return
-
-            # Resume mode specific initialization
-            bounds = load_parameter_bounds()
-            n_params = len(bounds)
+                else:
+                    response = input("Continue anyway? (y/n): ")
+                    if response.lower() != 'y':
+                        print("Cancelled.")
+                        return
 
             # Keep original max_evaluations from checkpoint
-            max_evaluations = checkpoint['max_evaluations']
-            remaining_evals = max_evaluations - checkpoint['eval_counter']
-            print(f"Remaining evaluations: {remaining_evals}\n")
+            config = build_run_config(args, n_params, checkpoint)
+            print(f"Remaining evaluations: {config.remaining_evals}\n")
 
             # Restore random state and seed
-            np.random.set_state(checkpoint['random_state'])
             args.seed = checkpoint.get('seed', None)  # Restore original seed for logging
-            print(f"Random state restored (original seed: {args.seed})")
+            if checkpoint.get('random_state') is not None:
+                np.random.set_state(checkpoint['random_state'])
+                print(f"Random state restored (original seed: {args.seed})")
+            else:
+                # e.g. checkpoints built from history by utils/create_checkpoint.py
+                print(f"No random state stored in checkpoint, re-seeding from seed: {args.seed}")
 
         except FileNotFoundError as e:
             print(f"ERROR: {e}")
@@ -316,74 +656,101 @@ Examples:
             return
 
     else:
-        # Normal mode (not resuming)
-        # Initialize components
-        bounds = load_parameter_bounds()
-        n_params = len(bounds)
-
-        # Calculate max_evaluations
-        if args.max_evals is None:
-            # Auto-calculate from popsize × n_params × generations
-            max_evaluations = args.popsize * n_params * args.generations
-        else:
-            # User-specified override
-            max_evaluations = args.max_evals
-
-        # For normal mode, remaining = total
-        remaining_evals = max_evaluations
-
-    # Print configuration
-    print("=" * 80)
-    print("PARAMETER CALIBRATION - AUTOMATED OPTIMIZATION (FILE TRIGGER MODE)")
-    print("=" * 80)
-    print()
-    print("IMPORTANT: Unity Editor must be open with the project loaded!")
-    print("Project: D:\\UnityProjects\\META_VERYOLD_P01_s")
-    print()
-    print(f"Algorithm:       {args.algorithm}")
-    print(f"Max Evaluations: {max_evaluations}")
-    print(f"Random Seed:     {args.seed if args.seed is not None else 'Random'}")
-    print(f"Unity Timeout:   {args.timeout}s per simulation")
-    print(f"Output Dir:      {args.output_dir}")
-
-    if args.algorithm == 'scipy_de':
-        actual_pop = args.popsize * n_params
-        print(f"\nScipyDE Configuration:")
-        print(f"  Population:    {args.popsize} (multiplier) → {actual_pop} individuals/generation")
-        print(f"  Generations:   {args.generations}")
-        print(f"  Strategy:      {args.strategy}")
+        # Normal mode: popsize × n_params × generations, or the --max-evals override
+        config = build_run_config(args, n_params)
+    max_evaluations = config.max_evaluations
+
+    # Print configuration (collected and written once, so it is not interleaved with worker output)
+    lines = []
+    lines.append("=" * 80)
+    lines.append("PARAMETER CALIBRATION - AUTOMATED OPTIMIZATION (FILE TRIGGER MODE)")
+    lines.append("=" * 80)
+    lines.append("")
+    lines.append("IMPORTANT: Unity Editor must be open with the project loaded!")
+    if len(args.project_path) > 1:
+        lines.append(f"Projects ({len(args.project_path)} parallel workers, one Unity Editor each):")
+        for project_path in args.project_path:
+            lines.append(f"  {project_path}")
+    else:
+        lines.append(f"Project: {args.project_path[0] or DEFAULT_PROJECT_DISPLAY}")
+        lines.append("         (serial: pass more --project-path clones to run simulations in parallel)")
+    lines.append("")
+    lines.append(f"Algorithm:       {args.algorithm}")
+    if config.auto_budget:
+        lines.append(f"Max Evaluations: {max_evaluations} "
+                     f"(popsize {args.popsize} × {n_params} params × {args.generations} generations)")
+    else:
+        lines.append(f"Max Evaluations: {max_evaluations}")
+    lines.append(f"Random Seed:     {args.seed if args.seed is not None else 'Random'}")
+    lines.append(f"Unity Timeout:   {args.timeout}s per simulation")
+    lines.append(f"Output Dir:      {args.output_dir}")
+    if args.allow_cache:
+        lines.append(f"Result Cache:    {Path(args.output_dir) / 'optimization_cache.jsonl'}")
+
+    if args.algorithm in DE_ALGORITHMS:
+        lines.append(f"\n{DE_ALGORITHMS[args.algorithm]} Configuration:")
+        lines.append(f"  Population:    {args.popsize} (multiplier) → {config.population_size} individuals/generation")
+        lines.append(f"  Generations:   {args.generations}")
+        lines.append(f"  Strategy:      {args.strategy}")
+        lines.append(f"  Mutation:      {args.mutation}")
+        lines.append(f"  Recombination: {args.recombination}")
         if args.max_evals is not None:
-            print(f"  Note:          max-evals override active ({args.max_evals} limit)")
+            lines.append(f"  Note:          max-evals override active ({args.max_evals} limit)")
+        if args.plateau_gens and args.algorithm == 'scipy_de':
+            lines.append(f"  Plateau Stop:  {args.plateau_gens} generations (eps={args.plateau_eps})")
 
-    print("=" * 80)
-    print()
+    lines.append("=" * 80)
+    lines.append("")
 
-    # Confirm with user (use remaining_evals for time estimate)
-    estimated_time = remaining_evals * 7 / 60  # 7 minutes per eval average
+    # Confirm with user (time estimate covers the remaining evaluations)
+    estimated_time = config.estimated_hours
     if args.resume:
-        print(f"Estimated remaining time: {estimated_time:.1f} hours ({estimated_time/24:.1f} days)")
-        print(f"This will run {remaining_evals} more Unity simulations (total: {checkpoint['eval_counter']}/{max_evaluations}).")
+        lines.append(f"Estimated remaining time: {estimated_time:.1f} hours ({estimated_time/24:.1f} days)")
+        lines.append(f"This will run {config.remaining_evals} more Unity simulations "
+                     f"(total: {config.completed_evals}/{max_evaluations}).")
     else:
-        print(f"Estimated total time: {estimated_time:.1f} hours ({estimated_time/24:.1f} days)")
-        print(f"This will run {max_evaluations} Unity simulations automatically.")
-    print(f"Unity Editor will remain open during optimization.")
-    print()
-
-    response = input("Continue? [y/n]: ").strip().lower()
-    if response != 'y':
-        print("Cancelled.")
+        lines.append(f"Estimated total time: {estimated_time:.1f} hours ({estimated_time/24:.1f} days)")
+        lines.append(f"This will run {max_evaluations} Unity simulations automatically.")
+    lines.append(f"Unity Editor will remain open during optimization.")
+    lines.append("")
+    sys.stdout.write("\n".join(lines) + "\n")
+    sys.stdout.flush()
+
+    if args.dry_run:
+        command = [arg for arg in sys.argv if arg != '--dry-run']
+        print("To run this configuration:")
+        print(f"  python {shlex.join(command)}")
+        print("\nDry run: exiting before Unity is started.")
         return
 
+    # Unattended runs (--yes, cron, resume loops) must not block on the prompt
+    if args.yes or not sys.stdin.isatty():
+        print("Continuing without confirmation (--yes or non-interactive stdin)")
+    else:
+        response = input("Continue? [y/n]: ").strip().lower()
+        if response != 'y':
+            print("Cancelled.")
+            return
+
     print("\nStarting optimization...\n")
+
+    # Simulation stack is only loaded once the run is confirmed
+    from core.unity_simulator import UnitySimulator
+    from core.objective_function import ObjectiveFunction, ParallelObjectiveFunction
+    from core.history_tracker import OptimizationHistory
     print(f"Loaded {n_params} parameter bounds")
 
-    # Use file trigger mode (Unity Editor must be open)
-    unity_sim = UnitySimulator(
-        unity_editor_path=args.unity_path,
-        project_path=args.project_path,
-        timeout=args.timeout,
-        use_file_trigger=True
-    )
+    # Use file trigger mode (Unity Editor must be open), one simulator per project
+    unity_sims = [
+        UnitySimulator(
+            unity_editor_path=args.unity_path,
+            project_path=project_path,
+            timeout=args.timeout,
+            use_file_trigger=True,
+            verbose=not args.quiet
+        )
+        for project_path in args.project_path
+    ]
 
     # Create history tracker with unique filename (or resume existing)
     output_dir = Path(args.output_dir)
@@ -395,32 +762,44 @@ Examples:
         history = OptimizationHistory(
             str(history_path),
             append=True,
-            start_iteration=0  # No offset needed - eval_counter already correct
+            start_iteration=0,  # No offset needed - eval_counter already correct
+            total_evals=config.remaining_evals,
+            flush_every=args.history_flush_every
         )
         print(f"History tracking: {history_path} (appending from eval {checkpoint['eval_counter']})")
     else:
         # Normal mode: create new history file
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        if args.algorithm == 'scipy_de':
+        if args.algorithm in DE_ALGORITHMS:
             # Simplified filename: only algorithm + strategy (no popsize)
-            simplified_name = f"ScipyDE_{args.strategy}"
+            simplified_name = f"{DE_ALGORITHMS[args.algorithm]}_{args.strategy}"
         else:
             simplified_name = args.algorithm
 
-        history_filename = f"history_{simplified_name}_{timestamp}.csv"
+        history_filename = f"history_{simplified_name}_{run_token}.csv"
         history_path = output_dir / history_filename
 
-        history = OptimizationHistory(str(history_path))
+        history = OptimizationHistory(str(history_path), total_evals=max_evaluations,
+                                      flush_every=args.history_flush_every)
         print(f"History tracking: {history_path}")
 
     print()
 
     # Create objective function
-    obj_func = ObjectiveFunction(
-        unity_simulator=unity_sim,
-        history_tracker=history,
-        verbose=True
-    )
+    cache_path = output_dir / "optimization_cache.jsonl" if args.allow_cache else None
+    if len(unity_sims) > 1:
+        obj_func = ParallelObjectiveFunction(
+            unity_simulators=unity_sims,
+            history_tracker=history,
+            verbose=not args.quiet,
+            cache_path=cache_path
+        )
+    else:
+        obj_func = ObjectiveFunction(
+            unity_simulator=unity_sims[0],
+            history_tracker=history,
+            verbose=not args.quiet,
+            cache_path=cache_path
+        )
 
     # Set initial best and eval counter if resuming
     if args.resume and checkpoint:
@@ -430,84 +809,104 @@ Examples:
     # Create optimizer (pass checkpoint for resume)
     optimizer = create_optimizer(args, bounds, obj_func, max_evaluations, checkpoint if args.resume else None)
 
+    # Cluster/service shutdowns send SIGTERM before SIGKILL: stop like Ctrl+C
+    # (checkpoint is already saved after every evaluation, so --resume picks up from there)
+    signal.signal(signal.SIGTERM, _raise_terminated)
+
     # Run optimization
+    finished = False  # False on Ctrl+C / SIGTERM / error: running simulations are stopped, not awaited
     try:
         result = optimizer.optimize()
 
         # Save results (with history CSV for accurate best)
-        result_file = save_results(result, output_dir, history_csv=history_path)
+        history.flush()
+        result_file, result_data = save_results(result, output_dir, history_csv=history_path, run_token=run_token,
+                                                top_k=args.top_k)
 
-        # Save best parameters separately (extract from result_file to get corrected best)
-        with open(result_file, 'r') as f:
-            result_data = json.load(f)
-        best_params_dict = result_data['best_params_dict']
+        # Save best parameters separately (corrected best from the history CSV)
         best_params_file = output_dir / "best_parameters.json"
-        with open(best_params_file, 'w') as f:
-            json.dump(best_params_dict, f, indent=2)
+        write_json(best_params_file, result_data['best_params_dict'])
         print(f"Best parameters saved: {best_params_file}")
 
-        # Automatic analysis and convergence plot
-        print("\n" + "=" * 80)
-        print("GENERATING ANALYSIS AND CONVERGENCE PLOT")
-        print("=" * 80)
-        from analysis.analyze_history import analyze_optimization_history
-        try:
-            analyze_optimization_history(str(history_path))
-        except Exception as e:
-            print(f"Warning: Analysis failed: {e}")
-            print("You can manually analyze with:")
-            print(f"  python dev/analysis/analyze_history.py {history_path}")
-
-        # Print summary (use corrected data from result_file)
-        print("\n" + "=" * 80)
-        print("OPTIMIZATION SUMMARY")
-        print("=" * 80)
-        print(f"Algorithm:         {result_data.get('algorithm_name', result.algorithm_name)}")
-        print(f"Success:           {result_data.get('success', result.success)}")
-        print(f"Best Objective:    {result_data.get('best_objective', result.best_objective):.4f}")
-        print(f"Best Iteration:    {result_data.get('best_iteration', 'N/A')}")
-        print(f"Best Generation:   {result_data.get('best_generation', 'N/A')}")
-        print(f"Total Evaluations: {result_data.get('n_evaluations', result.n_evaluations)}")
-        print(f"Message:           {result_data.get('message', result.message)}")
+        # Automatic analysis and convergence plot, in a detached process so that the
+        # summary and Unity cleanup do not wait for matplotlib (report goes to a log file)
+        analysis_log = history_path.with_name(history_path.stem + "_analysis.txt")
+        if not args.skip_analysis:
+            try:
+                with open(analysis_log, 'w') as log:
+                    subprocess.Popen(
+                        [sys.executable, str(Path(__file__).parent / "analysis" / "analyze_history.py"),
+                         str(history_path)],
+                        stdout=log,
+                        stderr=subprocess.STDOUT,
+                        start_new_session=True
+                    )
+                print(f"Analysis and convergence plot running in background: {analysis_log}")
+            except OSError as e:
+                print(f"Warning: Analysis failed to start: {e}")
+                print("You can manually analyze with:")
+                print(f"  python dev/analysis/analyze_history.py {history_path}")
+
+        # Print summary (use corrected data saved to result_file)
+        lines = []
+        lines.append("\n" + "=" * 80)
+        lines.append("OPTIMIZATION SUMMARY")
+        lines.append("=" * 80)
+        lines.append(f"Algorithm:         {result_data.get('algorithm_name', result.algorithm_name)}")
+        lines.append(f"Success:           {result_data.get('success', result.success)}")
+        lines.append(f"Best Objective:    {result_data.get('best_objective', result.best_objective):.4f}")
+        lines.append(f"Best Iteration:    {result_data.get('best_iteration', 'N/A')}")
+        lines.append(f"Best Generation:   {result_data.get('best_generation', 'N/A')}")
+        lines.append(f"Total Evaluations: {result_data.get('n_evaluations', result.n_evaluations)}")
+        lines.append(f"Message:           {result_data.get('message', result.message)}")
         if result_data.get('seed') is not None:
-            print(f"Random Seed:       {result_data['seed']}")
+            lines.append(f"Random Seed:       {result_data['seed']}")
 
         # Print best metrics if available
         if 'best_metrics' in result_data:
             metrics = result_data['best_metrics']
-            print()
-            print("Best Metrics:")
-            print(f"  RMSE:         {metrics.get('mean_error', 0):.4f}")
-            print(f"  Percentile95: {metrics.get('percentile_95', 0):.4f}")
-            print(f"  TimeGrowth:   {metrics.get('time_growth', 0):.4f}")
-            print(f"  DensityDiff:  {metrics.get('density_diff', 0):.4f}")
-        print()
-        print("Files created:")
-        print(f"  - Results:      {result_file}")
-        print(f"  - Best params:  {best_params_file}")
-        print(f"  - History:      {history_path}")
-
-        # Check if plot was created (same stem as CSV, different extension)
-        plot_file = history_path.with_suffix('.png')
-        if plot_file.exists():
-            print(f"  - Plot:         {plot_file}")
-
-        print("=" * 80)
+            lines.append("")
+            lines.append("Best Metrics:")
+            lines.append(f"  RMSE:         {metrics.get('mean_error', 0):.4f}")
+            lines.append(f"  Percentile95: {metrics.get('percentile_95', 0):.4f}")
+            lines.append(f"  TimeGrowth:   {metrics.get('time_growth', 0):.4f}")
+            lines.append(f"  DensityDiff:  {metrics.get('density_diff', 0):.4f}")
+        lines.append("")
+        lines.append("Files created:")
+        lines.append(f"  - Results:      {result_file}")
+        lines.append(f"  - Best params:  {best_params_file}")
+        lines.append(f"  - History:      {history_path}")
+
+        # Plot and analysis report are written by the background analysis (same stem as CSV)
+        if not args.skip_analysis:
+            lines.append(f"  - Plot:         {history_path.with_suffix('.png')} (when analysis finishes)")
+            lines.append(f"  - Analysis:     {analysis_log}")
+
+        lines.append("=" * 80)
 
         # Print reproduction command
         if result.seed is not None:
-            print()
-            print("To reproduce this result:")
-            if args.algorithm == 'scipy_de':
-                print(f"  python dev/run_optimization.py --algorithm scipy_de --popsize {args.popsize} --generations {args.generations} --seed {result.seed}")
+            lines.append("")
+            lines.append("To reproduce this result:")
+            if args.algorithm in DE_ALGORITHMS:
+                lines.append(f"  python dev/run_optimization.py --algorithm {args.algorithm} --popsize {args.popsize} --generations {args.generations} --seed {result.seed}")
             else:
-                print(f"  python dev/run_optimization.py --algorithm {args.algorithm} --seed {result.seed}")
-            print("=" * 80)
+                lines.append(f"  python dev/run_optimization.py --algorithm {args.algorithm} --seed {result.seed}")
+            lines.append("=" * 80)
+
+        sys.stdout.write("\n".join(lines) + "\n")
+        sys.stdout.flush()
+        finished = True
 
-    except KeyboardInterrupt:
-        print("\n\nOptimization interrupted by user (Ctrl+C)")
+    except KeyboardInterrupt as e:
+        history.flush()  # Buffered rows reach disk before reporting them as saved
+        if isinstance(e, _Terminated):
+            print("\n\nOptimization terminated (SIGTERM)")
+        else:
+            print("\n\nOptimization interrupted by user (Ctrl+C)")
         print(f"Partial results saved to: {history_path}")
-        sys.exit(1)
+        print("Continue with --resume (checkpoint from the last completed evaluation)")
+        sys.exit(143 if isinstance(e, _Terminated) else 1)
 
     except Exception as e:
         print(f"\n\nOptimization failed with error:")
@@ -516,7 +915,12 @@ Examples:
         raise
 
     finally:
-        unity_sim.cleanup()
+        try:
+            obj_func.close(abort=not finished)
+            history.close()
+        finally:
+            for unity_sim in unity_sims:
+                unity_sim.cleanup()
 
 
 if __name__ == '__main__':
@@ -8,12 +8,20 @@ Usage:
     python dev/utils/create_checkpoint.py
 """
 
-import pickle
-import csv
+import sys
 import numpy as np
 from pathlib import Path
 from datetime import datetime
 
+# Add dev to path
+_DEV_DIR = str(Path(__file__).parent.parent)
+if _DEV_DIR not in sys.path:  # Already there when run as a dev/ script
+    sys.path.append(_DEV_DIR)
+
+from core.checkpoint import save_checkpoint
+from core.history_tracker import load_history_columns
+from export_to_unity import PARAMETER_NAMES
+
 
 def create_checkpoint_from_history():
     """Create checkpoint from rebuilt history CSV."""
@@ -35,40 +43,32 @@ def create_checkpoint_from_history():
     print("=" * 80)
     print(f"Reading history: {history_file.name}")
 
-    # Read CSV
-    rows = []
-    with open(history_file, 'r') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            rows.append(row)
+    # Numeric columns as one float64 array (from the .npz mirror if up to date)
+    columns = ['iteration', 'generation', 'objective', 'mean_error', 'percentile_95'] + PARAMETER_NAMES
+    _, data = load_history_columns(history_file, columns)
 
-    print(f"Total evaluations: {len(rows)}")
+    print(f"Total evaluations: {len(data)}")
 
-    # Find best evaluation
-    best_row = min(rows, key=lambda r: float(r['objective']))
-    best_iteration = int(best_row['iteration'])
-    best_objective = float(best_row['objective'])
+    if len(data) == 0:
+        print("ERROR: History file has no evaluations")
+        return
+
+    # Best evaluation (first one if tied)
+    best = data[int(np.argmin(data[:, 2]))]
+    best_iteration = int(best[0])
+    best_objective = float(best[2])
 
     print(f"\nBest evaluation found:")
     print(f"  Iteration:  {best_iteration}")
     print(f"  Objective:  {best_objective:.4f}")
-    print(f"  RMSE:       {float(best_row['mean_error']):.4f}")
-    print(f"  P95:        {float(best_row['percentile_95']):.4f}")
-
-    # Extract best parameters (18 values)
-    param_names = [
-        'minimalDistance', 'relaxationTime', 'repulsionStrengthAgent',
-        'repulsionRangeAgent', 'lambdaAgent', 'repulsionStrengthObs',
-        'repulsionRangeObs', 'lambdaObs', 'k', 'kappa', 'obsK', 'obsKappa',
-        'considerationRange', 'viewAngle', 'viewAngleMax', 'viewDistance',
-        'rayStepAngle', 'visibleFactor'
-    ]
-    best_params = np.array([float(best_row[name]) for name in param_names])
+    print(f"  RMSE:       {best[3]:.4f}")
+    print(f"  P95:        {best[4]:.4f}")
+
+    best_params = best[5:].copy()  # 18 values in PARAMETER_NAMES order
 
     # Last evaluation (checkpoint point)
-    last_row = rows[-1]
-    last_iteration = int(last_row['iteration'])
-    last_generation = int(last_row['generation'])
+    last_iteration = int(data[-1, 0])
+    last_generation = int(data[-1, 1])
 
     print(f"\nCheckpoint will be created at:")
     print(f"  Last iteration: {last_iteration}")
@@ -82,7 +82,6 @@ def create_checkpoint_from_history():
         'generation': last_generation,
         'best_params': best_params,
         'best_objective': best_objective,
-        'random_state': np.random.get_state(),  # New random state
         'history_csv': str(history_file),
         'algorithm': 'ScipyDE_pop10_best1bin',
         'popsize': 10,
@@ -92,9 +91,7 @@ def create_checkpoint_from_history():
     }
 
     # Save checkpoint
-    checkpoint_path = Path("data/output/checkpoint_latest.pkl")
-    with open(checkpoint_path, 'wb') as f:
-        pickle.dump(checkpoint, f)
+    checkpoint_path = save_checkpoint(checkpoint)
 
     print("\n" + "=" * 80)
     print("✅ CHECKPOINT CREATED SUCCESSFULLY!")
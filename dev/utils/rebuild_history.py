@@ -5,30 +5,187 @@ This script recreates the history CSV from eval_0001 to eval_XXXX result files.
 Used when resuming optimization from previous runs.
 
 Usage:
-    python dev/utils/rebuild_history.py
+    python dev/utils/rebuild_history.py          # Append results newer than the CSV
+    python dev/utils/rebuild_history.py --full   # Rebuild the CSV from scratch
+
+Objectives are cached in data/output/results/.objective_cache.json (keyed by
+result file mtime/size and a fingerprint of evaluate_objective.py, so changed
+weights or objective code invalidate it). --full ignores the cache and
+recomputes every objective.
 """
 
+import argparse
+import csv
+import hashlib
 import json
+import os
 import sys
+from concurrent.futures import ProcessPoolExecutor
+from operator import itemgetter
 import numpy as np
 from pathlib import Path
 from datetime import datetime
 
 # Add dev to path
-sys.path.append(str(Path(__file__).parent.parent))
+_DEV_DIR = str(Path(__file__).parent.parent)
+if _DEV_DIR not in sys.path:  # Already there when run as a dev/ script
+    sys.path.append(_DEV_DIR)
 
+import evaluate_objective as objective_module
 from evaluate_objective import load_simulation_result, evaluate_objective
 from export_to_unity import PARAMETER_NAMES
-from core.history_tracker import OptimizationHistory
+from core.history_tracker import OptimizationHistory, write_history_npz
+
+# Result files handed to a worker process per task (amortizes IPC overhead)
+CHUNKSIZE = 16
+
+# Parameter values of a result dict in PARAMETER_NAMES order (one C-level call)
+_get_params = itemgetter(*PARAMETER_NAMES)
+
+# Individuals per generation of the original run (popsize=10, n_params=18)
+POPULATION_SIZE = 10 * len(PARAMETER_NAMES)  # 180
+
+# Objective cache next to the result files:
+# {'fingerprint': ..., 'files': {file name -> (mtime, size, objective, metrics, params)}}
+CACHE_FILENAME = ".objective_cache.json"
+
+
+def _process_result_file(result_file: Path):
+    """
+    Load one result file and compute its objective (runs in a worker process).
+
+    Args:
+        result_file: Path to eval_XXXX_result.json
+
+    Returns:
+        (objective, params_array, metrics)
+    """
+    result_data = load_simulation_result(str(result_file))
+    objective, metrics = evaluate_objective(result_data)
+
+    # Extract parameters (18 values)
+    params_array = np.fromiter(_get_params(result_data['parameters']), dtype=np.float64,
+                               count=len(PARAMETER_NAMES))
+
+    return objective, params_array, metrics
+
+
+def _objective_fingerprint() -> str:
+    """Hash of evaluate_objective.py (weights and objective code)."""
+    return hashlib.sha256(Path(objective_module.__file__).read_bytes()).hexdigest()[:16]
+
+
+def _load_cache(cache_path: Path, fingerprint: str) -> dict:
+    """
+    Load the objective cache entries.
+
+    Args:
+        cache_path: Cache file path
+        fingerprint: Current objective fingerprint (see _objective_fingerprint)
+
+    Returns:
+        file name -> entry dict (empty if missing, unreadable or computed by a different objective)
+    """
+    try:
+        with open(cache_path, 'r') as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(cache, dict) or cache.get('fingerprint') != fingerprint:
+        print("[Rebuild] Objective function changed since the cache was written, recomputing all objectives")
+        return {}
+    return cache.get('files', {})
+
 
+def _save_cache(cache_path: Path, cache: dict, fingerprint: str):
+    """Write the objective cache atomically (a failed write only costs a recompute)."""
+    tmp_path = cache_path.with_name(cache_path.name + ".tmp")
+    try:
+        with open(tmp_path, 'w') as f:
+            json.dump({'fingerprint': fingerprint, 'files': cache}, f)
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        print(f"[Rebuild] WARNING: Failed to write objective cache {cache_path}: {e}")
 
-def rebuild_history_from_results():
-    """Rebuild history CSV from eval_0001 to eval_XXXX result files."""
+
+def _iter_results(result_files: list, cache: dict, executor: ProcessPoolExecutor):
+    """
+    Yield (iteration, objective, params_array, metrics) for each result file in order.
+
+    Files whose modification time and size match their cache entry are taken
+    from the cache; the others are evaluated in the process pool and their
+    cache entries are updated in place.
+
+    Args:
+        result_files: (iteration, path) pairs sorted by iteration
+        cache: Objective cache dict (see CACHE_FILENAME)
+        executor: Process pool for files that need evaluation
+    """
+    stamps = {}
+    misses = []
+    for _, result_file in result_files:
+        stat = result_file.stat()
+        stamps[result_file] = [stat.st_mtime_ns, stat.st_size]
+        entry = cache.get(result_file.name)
+        if entry is None or entry[:2] != stamps[result_file]:
+            misses.append(result_file)
+
+    computed = executor.map(_process_result_file, misses, chunksize=CHUNKSIZE)
+    missed = set(misses)
+
+    for iteration, result_file in result_files:
+        if result_file in missed:
+            objective, params_array, metrics = next(computed)
+            metrics = {key: float(value) for key, value in metrics.items()}
+            cache[result_file.name] = stamps[result_file] + [float(objective), metrics, params_array.tolist()]
+        else:
+            _, _, objective, metrics, params = cache[result_file.name]
+            params_array = np.array(params, dtype=np.float64)
+        yield iteration, objective, params_array, metrics
+
+
+def _last_recorded_iteration(history_path: Path) -> int:
+    """
+    Highest iteration already in a history CSV.
+
+    Args:
+        history_path: History CSV written by OptimizationHistory
+
+    Returns:
+        Last iteration number (0 if the file has no usable rows)
+    """
+    last_iteration = 0
+    with open(history_path, 'r', newline='') as f:
+        reader = csv.reader(f)
+        header = next(reader, [])
+        if 'iteration' not in header:
+            return 0
+        column = header.index('iteration')
+        for row in reader:
+            if len(row) > column and row[column].isdigit():
+                last_iteration = max(last_iteration, int(row[column]))
+    return last_iteration
+
+
+def rebuild_history_from_results(full: bool = False):
+    """
+    Rebuild history CSV from eval_0001 to eval_XXXX result files.
+
+    If the history CSV already exists, only result files after its last
+    iteration are processed and appended (unless full=True).
+
+    Args:
+        full: Overwrite the history CSV and recompute every result file (objective cache not read)
+    """
 
     results_dir = Path("data/output/results")
 
-    # Find all result files
-    result_files = sorted(results_dir.glob("eval_*_result.json"))
+    # Find all result files as (iteration, path), in numeric order (eval_0001 -> 1;
+    # a plain name sort would put eval_10000 before eval_2000)
+    result_files = sorted(
+        ((int(path.stem.split('_')[1]), path) for path in results_dir.glob("eval_*_result.json")),
+        key=itemgetter(0)
+    )
 
     if not result_files:
         print("ERROR: No result files found in data/output/results/")
@@ -38,15 +195,31 @@ def rebuild_history_from_results():
     print("REBUILD OPTIMIZATION HISTORY FROM RESULTS")
     print("=" * 80)
     print(f"Found {len(result_files)} result files")
-    print(f"Range: {result_files[0].name} to {result_files[-1].name}")
+    print(f"Range: {result_files[0][1].name} to {result_files[-1][1].name}")
 
     # Use existing filename pattern: history_ScipyDE_best1bin_YYYYMMDD_HHMMSS.csv
     # Keep original date (20251020) to maintain continuity
     history_filename = "history_ScipyDE_best1bin_20251020_134139.csv"
     history_path = Path("data/output") / history_filename
 
+    # Incremental mode: skip result files already recorded in the CSV
+    last_iteration = 0
+    if not full and history_path.exists():
+        last_iteration = _last_recorded_iteration(history_path)
+    append = last_iteration > 0
+    if append:
+        result_files = [(iteration, f) for iteration, f in result_files if iteration > last_iteration]
+
     print(f"\nTarget file: {history_filename}")
-    print(f"This will OVERWRITE the existing file with {len(result_files)} rows")
+    if append:
+        print(f"Existing file covers up to eval_{last_iteration:04d} (use --full to rebuild from scratch)")
+        if not result_files:
+            print("History is already up to date.")
+            print("=" * 80)
+            return
+        print(f"This will APPEND {len(result_files)} rows to the existing file")
+    else:
+        print(f"This will OVERWRITE the existing file with {len(result_files)} rows")
     print("=" * 80)
     print()
 
@@ -57,51 +230,60 @@ def rebuild_history_from_results():
 
     print("\nRebuilding history...")
 
-    # Create new history file (overwrites existing)
-    history = OptimizationHistory(str(history_path))
-
-    # Process each result file
-    for i, result_file in enumerate(result_files, 1):
-        # Extract iteration number from filename (eval_0001 -> 1)
-        iteration = int(result_file.stem.split('_')[1])
+    # Create new history file (overwrites existing) or append to it. Rows go through
+    # the buffered file and are flushed per generation and on close, not per row.
+    history = OptimizationHistory(str(history_path), append=append, total_evals=len(result_files),
+                                  flush_every=len(result_files))
 
-        # Load result
-        result_data = load_simulation_result(str(result_file))
+    # Parse and score changed result files in parallel (unchanged ones come from
+    # the objective cache, except with --full); rows are added in file order
+    cache_path = results_dir / CACHE_FILENAME
+    fingerprint = _objective_fingerprint()
+    cache = {} if full else _load_cache(cache_path, fingerprint)
+    with ProcessPoolExecutor() as executor:
+        processed = _iter_results(result_files, cache, executor)
+        for i, (iteration, objective, params_array, metrics) in enumerate(processed, 1):
+            generation = ((iteration - 1) // POPULATION_SIZE) + 1
 
-        # Compute objective
-        objective, metrics = evaluate_objective(result_data)
+            # Add to history
+            history.add_evaluation(
+                iteration=iteration,
+                objective=objective,
+                params=params_array,
+                metrics=metrics,
+                generation=generation
+            )
 
-        # Extract parameters (18 values)
-        params_dict = result_data['parameters']
-        params_array = np.array([params_dict[name] for name in PARAMETER_NAMES])
+            # Progress
+            if i % 50 == 0 or i == len(result_files):
+                print(f"  Processed {i}/{len(result_files)} evaluations...")
 
-        # Calculate generation (popsize=10, n_params=18)
-        population_size = 10 * 18  # 180
-        generation = ((iteration - 1) // population_size) + 1
+    history.close()
+    _save_cache(cache_path, cache, fingerprint)
 
-        # Add to history
-        history.add_evaluation(
-            iteration=iteration,
-            objective=objective,
-            params=params_array,
-            metrics=metrics,
-            generation=generation
-        )
-
-        # Progress
-        if i % 50 == 0 or i == len(result_files):
-            print(f"  Processed {i}/{len(result_files)} evaluations...")
+    # Binary mirror for create_checkpoint.py (skips CSV parsing)
+    npz_path = write_history_npz(history_path)
 
     print("\n" + "=" * 80)
     print("✅ HISTORY REBUILT SUCCESSFULLY!")
     print("=" * 80)
     print(f"File: {history_path}")
-    print(f"Rows: {len(result_files)}")
-    print(f"Range: eval_0001 to eval_{len(result_files):04d}")
+    print(f"Mirror: {npz_path}")
+    print(f"Rows: {len(result_files)}" + (" (appended)" if append else ""))
+    print(f"Range: {result_files[0][1].name} to {result_files[-1][1].name}")
     print("=" * 80)
     print()
     print("Next step: Run create_checkpoint.py to create checkpoint for resume")
 
 
 if __name__ == '__main__':
-    rebuild_history_from_results()
+    parser = argparse.ArgumentParser(description="Rebuild optimization history CSV from result files")
+    parser.add_argument(
+        '--full',
+        action='store_true',
+        help='Overwrite the history CSV and recompute every objective without the cache '
+             '(default: append new results only)'
+    )
+    args = parser.parse_args()
+
+    rebuild_history_from_results(full=args.full)